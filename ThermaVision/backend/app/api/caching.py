@@ -0,0 +1,70 @@
+"""
+HTTP conditional-caching helpers.
+
+Analysis results are a pure function of the request body and the engine
+parameter snapshot, so an ETag can be derived from the canonical request
+plus the parameter version without running the analysis. Clients that send
+it back in If-None-Match get a 304 and skip both the computation and the
+download.
+"""
+
+import hashlib
+import json
+from typing import Optional
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# POST responses: cacheable by the browser, but revalidated every time
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+# Versioned GET /report/{hash}?v=…: the URL pins the request and the
+# parameter version, so its content never changes and intermediaries may share it
+CACHE_CONTROL_SHARED = "public, max-age=3600"
+
+
+def canonical_json(model: BaseModel) -> str:
+    """Deterministic JSON for a request model (sorted keys, no whitespace)."""
+    return json.dumps(model.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(model: BaseModel) -> str:
+    """Stable hex digest identifying a request body."""
+    return hashlib.sha256(canonical_json(model).encode()).hexdigest()
+
+
+def make_etag(scope: str, model: BaseModel, parameter_version: str) -> str:
+    """
+    Weak ETag for the response of `scope` (the endpoint) to this request.
+
+    Weak because the same tag covers the gzip and identity encodings.
+    """
+    digest = hashlib.sha256(
+        f"{scope}\n{parameter_version}\n{canonical_json(model)}".encode()
+    ).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match lists this ETag (weak comparison).
+
+    "*" only matches on GET/HEAD; for POST it would turn every call into a 304.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return request.method in ("GET", "HEAD")
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str, location: Optional[str] = None) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if location:
+        response.headers["Content-Location"] = location
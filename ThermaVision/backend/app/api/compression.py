@@ -0,0 +1,50 @@
+"""
+Response compression that skips already-compressed media types.
+
+Starlette's GZipMiddleware leaves a response alone when it already carries a
+Content-Encoding header. Responses whose media type is in
+PRECOMPRESSED_TYPES (fpdf2 PDFs use deflate-compressed streams) are marked
+that way on the inner side of the gzip layer, and the marker is removed
+again on the outer side, so clients never see it.
+"""
+
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PRECOMPRESSED_TYPES = ("application/pdf",)
+
+_MARKER = "identity"
+
+
+class SelectiveGZipMiddleware:
+    """GZipMiddleware that passes PRECOMPRESSED_TYPES through uncompressed."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500):
+        self.app = app
+        self.gzip = GZipMiddleware(self._mark_precompressed, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def unmark(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-encoding") == _MARKER:
+                    del headers["content-encoding"]
+            await send(message)
+
+        await self.gzip(scope, receive, unmark)
+
+    async def _mark_precompressed(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def mark(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                content_type = headers.get("content-type", "")
+                if "content-encoding" not in headers and content_type.startswith(PRECOMPRESSED_TYPES):
+                    headers["Content-Encoding"] = _MARKER
+            await send(message)
+
+        await self.app(scope, receive, mark)
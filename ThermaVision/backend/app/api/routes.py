@@ -1,25 +1,44 @@
 """
-API routes — single router with the /analyze endpoint + PDF download.
+API routes — single router with the /analyze endpoint, PDF download,
+queries over stored analyses and background jobs.
 """
 
-from fastapi import APIRouter, Response, HTTPException
-from ..models.schemas import AnalysisRequest, AnalysisResponse, ChatRequest, ChatResponse
-from ..engine.calculator import (
-    calculate_heat_recovered,
-    calculate_steam_saved,
-    calculate_annual_savings,
-    calculate_payback,
-    calculate_co2_reduction,
-    calculate_efficiency_gain,
+from typing import Optional
+from fastapi import APIRouter, Request, Response, HTTPException, Query
+from fastapi.responses import FileResponse, RedirectResponse
+from pydantic import ValidationError
+from ..models.schemas import (
+    AnalysisRequest,
+    AnalysisResponse,
+    AnalysisPage,
+    StoredAnalysis,
+    ParameterSet,
+    GoalSeekRequest,
+    GoalSeekResponse,
+    ExploreRequest,
+    ExploreResponse,
+    CascadeRequest,
+    CascadeResponse,
+    FuelType,
+    JobSubmitRequest,
+    JobStatus,
+    ReportLink,
+    ChatRequest,
+    ChatResponse,
 )
-from ..engine.optimizer import (
-    recommend_heat_exchanger,
-    generate_scenarios,
-    project_roi_5yr,
-    calculate_climate_equivalence,
+from ..engine.parameters import ParameterSnapshot, get_parameters, get_registry
+from ..storage.analysis_store import get_analysis_store, SORT_KEYS
+from ..jobs.manager import get_job_manager, QueueFullError
+from .handlers import run_analysis, run_goal_seek, run_explore, run_cascade, build_report_pdf
+from .caching import (
+    CACHE_CONTROL_REVALIDATE,
+    CACHE_CONTROL_SHARED,
+    content_hash,
+    make_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
 )
-from ..engine.insights import generate_ai_summary
-from fpdf import FPDF
 import io
 import os
 from groq import Groq
@@ -27,201 +46,259 @@ from groq import Groq
 router = APIRouter()
 
 
-def _sanitize_pdf(text: str) -> str:
-    """Replace unicode characters that Helvetica cannot render."""
-    replacements = {
-        "\u2014": "--",  # em-dash
-        "\u2013": "-",   # en-dash
-        "\u2018": "'",   # left single quote
-        "\u2019": "'",   # right single quote
-        "\u201c": '"',   # left double quote
-        "\u201d": '"',   # right double quote
-        "\u2026": "...", # ellipsis
-        "\u00b2": "2",   # superscript 2
-        "\u2248": "~",   # approx
-        "\u00b0": " deg",# degree
-        "\u2022": "*",   # bullet
-        "\u20ac": "EUR", # euro
-        "\u00a3": "GBP", # pound
-        "\u2705": "[OK]",
-        "\u26a0\ufe0f": "[!]",
-        "\u26a0": "[!]",
-        "\u2757": "[!]",
-        "\u20b9": "Rs.",   # indian rupee
-    }
-    for k, v in replacements.items():
-        text = text.replace(k, v)
-    # Strip any remaining non-latin1 characters
-    return text.encode("latin-1", errors="replace").decode("latin-1")
-
-
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze(req: AnalysisRequest):
+async def analyze(req: AnalysisRequest, request: Request, response: Response):
     """
     Main analysis endpoint.
 
     Accepts plant parameters, runs all calculations,
     generates scenarios, recommendations, and AI insight.
+    Answers 304 when If-None-Match carries the current ETag.
     """
-    # --- Core calculations ---
-    heat_kw = calculate_heat_recovered(req.flow_rate, req.flue_temp_in, req.flue_temp_out)
-    steam = calculate_steam_saved(heat_kw)
-    savings = calculate_annual_savings(steam, req.operating_hours, req.fuel_cost)
-    payback = calculate_payback(req.installation_cost, savings)
-    co2 = calculate_co2_reduction(steam, req.operating_hours, req.fuel_type.value)
-    eff = calculate_efficiency_gain(heat_kw, req.flow_rate, req.flue_temp_in)
-
-    # --- Multi-scenario ---
-    scenarios = generate_scenarios(
-        req.flow_rate, req.flue_temp_in, req.flue_temp_out,
-        req.fuel_type.value, req.fuel_cost,
-        req.operating_hours, req.installation_cost,
-    )
+    # One parameter snapshot for the whole request, even across a hot reload
+    params = get_parameters()
+    etag = make_etag("analyze", req, params.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_CONTROL_REVALIDATE)
 
-    # --- Recommendation ---
-    rec = recommend_heat_exchanger(req.flue_temp_in, req.flue_temp_out)
+    result = run_analysis(req, params)
 
-    # --- 5-year ROI ---
-    roi_5yr = project_roi_5yr(savings, req.installation_cost)
+    # --- Persist (queued; committed in batches by the store's writer) ---
+    get_analysis_store().record(req.model_dump(mode="json"), result.model_dump(mode="json"))
 
-    # --- Climate impact ---
-    climate = calculate_climate_equivalence(co2)
+    set_cache_headers(response, etag, CACHE_CONTROL_REVALIDATE)
+    return result
 
-    # --- Energy breakdown ---
-    total_input_kw = (req.flow_rate * 1.0 * req.flue_temp_in) / 3600.0
-    energy_recovered_pct = round((heat_kw / total_input_kw) * 100, 2) if total_input_kw > 0 else 0
-    energy_lost_pct = round(100 - energy_recovered_pct, 2)
 
-    # --- AI insight ---
-    summary = generate_ai_summary(
-        heat_kw, steam, savings, payback, co2, eff,
-        req.fuel_type.value, rec["heat_exchanger_type"],
-        rec["dew_point_warning"],
-    )
+@router.post("/goal-seek", response_model=GoalSeekResponse)
+def goal_seek(req: GoalSeekRequest, request: Request, response: Response):
+    """
+    Inverse solve: find the value of one input that makes a metric hit a target.
 
-    return AnalysisResponse(
-        heat_recovered_kW=heat_kw,
-        steam_saved_kg_hr=steam,
-        annual_savings=savings,
-        payback_years=payback,
-        co2_reduction_tons=co2,
-        efficiency_gain_pct=eff,
-        scenarios=scenarios,
-        recommendation=rec,
-        climate_impact=climate,
-        ai_summary=summary,
-        roi_5yr=roi_5yr,
-        energy_recovered_pct=energy_recovered_pct,
-        energy_lost_pct=energy_lost_pct,
-    )
+    Example: the outlet temperature that gives a 2-year payback for every
+    plant in the request — target_metric=payback_years, target_value=2,
+    free_variable=flue_temp_out.
+    """
+    params = get_parameters()
+    etag = make_etag("goal-seek", req, params.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_CONTROL_REVALIDATE)
+    set_cache_headers(response, etag, CACHE_CONTROL_REVALIDATE)
+    return run_goal_seek(req, params)
 
 
-@router.post("/report")
-async def generate_report(req: AnalysisRequest):
+@router.post("/explore", response_model=ExploreResponse)
+def explore(req: ExploreRequest, request: Request, response: Response):
     """
-    Generate and return a downloadable PDF technical report.
+    Pareto-frontier design explorer.
+
+    Sweeps outlet temperature × heat-exchanger type × material class for
+    every plant and returns only the non-dominated designs (capex, annual
+    savings, CO2 avoided, corrosion risk) as compact arrays for charting.
     """
-    # Re-run analysis
-    heat_kw = calculate_heat_recovered(req.flow_rate, req.flue_temp_in, req.flue_temp_out)
-    steam = calculate_steam_saved(heat_kw)
-    savings = calculate_annual_savings(steam, req.operating_hours, req.fuel_cost)
-    payback = calculate_payback(req.installation_cost, savings)
-    co2 = calculate_co2_reduction(steam, req.operating_hours, req.fuel_type.value)
-    eff = calculate_efficiency_gain(heat_kw, req.flow_rate, req.flue_temp_in)
-    rec = recommend_heat_exchanger(req.flue_temp_in, req.flue_temp_out)
-    climate = calculate_climate_equivalence(co2)
-    summary = generate_ai_summary(
-        heat_kw, steam, savings, payback, co2, eff,
-        req.fuel_type.value, rec["heat_exchanger_type"],
-        rec["dew_point_warning"],
-    )
+    params = get_parameters()
+    etag = make_etag("explore", req, params.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_CONTROL_REVALIDATE)
+    try:
+        result = run_explore(req, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_cache_headers(response, etag, CACHE_CONTROL_REVALIDATE)
+    return result
+
+
+@router.post("/cascade", response_model=CascadeResponse)
+def cascade(req: CascadeRequest, request: Request, response: Response):
+    """
+    Multi-stage cascade evaluation.
+
+    Enumerates ordered chains of waste heat boiler → economizer → air
+    preheater with every intermediate temperature split, keeping the tail
+    above the dew point, and returns the best top_k by rank_by.
+    """
+    params = get_parameters()
+    etag = make_etag("cascade", req, params.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_CONTROL_REVALIDATE)
+    try:
+        result = run_cascade(req, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_cache_headers(response, etag, CACHE_CONTROL_REVALIDATE)
+    return result
+
+
+@router.get("/analyses", response_model=AnalysisPage)
+def list_analyses(
+    plant_id: Optional[str] = None,
+    fuel_type: Optional[FuelType] = None,
+    min_payback: Optional[float] = Query(None, ge=0),
+    max_payback: Optional[float] = Query(None, ge=0),
+    min_co2: Optional[float] = Query(None, ge=0),
+    max_co2: Optional[float] = Query(None, ge=0),
+    sort: str = Query("id", description=f"One of: {', '.join(SORT_KEYS)}"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    """
+    List stored analyses with filters and keyset pagination.
+
+    Example: all coal plants with payback under 2 years, fastest first —
+    /analyses?fuel_type=Coal&max_payback=2&sort=payback_years
+    """
+    try:
+        rows, next_cursor = get_analysis_store().query(
+            plant_id=plant_id,
+            fuel_type=fuel_type.value if fuel_type else None,
+            min_payback=min_payback,
+            max_payback=max_payback,
+            min_co2=min_co2,
+            max_co2=max_co2,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AnalysisPage(items=rows, next_cursor=next_cursor)
+
+
+@router.get("/analyses/{analysis_id}", response_model=StoredAnalysis)
+def get_analysis(analysis_id: int):
+    """Return one stored analysis with its full request and response."""
+    record = get_analysis_store().get(analysis_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return record
+
+
+def _register_report(req: AnalysisRequest) -> str:
+    """Store the report request under its content hash and return the hash."""
+    digest = content_hash(req)
+    get_analysis_store().save_report_request(digest, req.model_dump(mode="json"))
+    return digest
+
+
+def _report_url(digest: str, parameter_version: str) -> str:
+    """Versioned report URL: fixed content for one request under one parameter set."""
+    return f"/report/{digest}?v={parameter_version}"
+
 
-    # Build PDF
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-
-    # Title
-    pdf.set_font("Helvetica", "B", 20)
-    pdf.cell(0, 15, "Waste Heat Recovery - Technical Report", ln=True, align="C")
-    pdf.ln(5)
-
-    pdf.set_font("Helvetica", "", 10)
-    pdf.cell(0, 8, "Generated by Smart Flue Gas WHR Intelligence Portal", ln=True, align="C")
-    pdf.ln(10)
-
-    # Input Parameters
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "1. Input Parameters", ln=True)
-    pdf.set_font("Helvetica", "", 11)
-    params = [
-        f"Flue Gas Inlet Temperature: {req.flue_temp_in} C",
-        f"Flue Gas Outlet Temperature: {req.flue_temp_out} C",
-        f"Flow Rate: {req.flow_rate:,.0f} kg/hr",
-        f"Fuel Type: {req.fuel_type.value}",
-        f"Fuel Cost: Rs. {req.fuel_cost}/kg",
-        f"Operating Hours: {req.operating_hours:,.0f} hrs/yr",
-        f"Installation Cost: Rs. {req.installation_cost:,.0f}",
-    ]
-    for p in params:
-        pdf.cell(0, 7, _sanitize_pdf(f"  - {p}"), ln=True)
-    pdf.ln(5)
-
-    # Results
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "2. Analysis Results", ln=True)
-    pdf.set_font("Helvetica", "", 11)
-    results = [
-        f"Heat Recovered: {heat_kw:,.2f} kW",
-        f"Steam Saved: {steam:,.2f} kg/hr",
-        f"Annual Savings: Rs. {savings:,.2f}",
-        f"Payback Period: {payback:.2f} years",
-        f"CO2 Reduction: {co2:,.2f} tons/year",
-        f"Efficiency Gain: {eff:.2f}%",
-    ]
-    for r in results:
-        pdf.cell(0, 7, _sanitize_pdf(f"  - {r}"), ln=True)
-    pdf.ln(5)
-
-    # Recommendation
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "3. Recommendation", ln=True)
-    pdf.set_font("Helvetica", "", 11)
-    pdf.cell(0, 7, _sanitize_pdf(f"  Equipment: {rec['heat_exchanger_type']}"), ln=True)
-    pdf.cell(0, 7, _sanitize_pdf(f"  Optimal Exit Temp: {rec['optimal_exit_temp']} C"), ln=True)
-    pdf.cell(0, 7, _sanitize_pdf(f"  {rec['efficiency_improvement']}"), ln=True)
-    if rec["dew_point_warning"]:
-        pdf.set_text_color(200, 0, 0)
-        pdf.cell(0, 7, _sanitize_pdf(f"  WARNING: {rec.get('warning_message', '')}"), ln=True)
-        pdf.set_text_color(0, 0, 0)
-    pdf.ln(5)
-
-    # Climate Impact
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "4. Five-Year Climate Impact", ln=True)
-    pdf.set_font("Helvetica", "", 11)
-    pdf.cell(0, 7, f"  Total CO2 Avoided: {climate['total_co2_avoided_tons']:,.0f} tons", ln=True)
-    pdf.cell(0, 7, f"  Equivalent Trees Planted: {climate['equivalent_trees_planted']:,}", ln=True)
-    pdf.cell(0, 7, f"  Equivalent Cars Removed: {climate['equivalent_cars_removed']:,}", ln=True)
-    pdf.ln(5)
-
-    # AI Summary
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.cell(0, 10, "5. Executive Summary", ln=True)
-    pdf.set_font("Helvetica", "", 11)
-    pdf.multi_cell(0, 7, _sanitize_pdf(summary))
-
-    # Footer
-    pdf.ln(15)
-    pdf.set_font("Helvetica", "I", 9)
-    pdf.cell(0, 8, "This report was automatically generated. All values are estimates based on standard engineering assumptions.", ln=True, align="C")
-
-    # Output
-    pdf_bytes = pdf.output()
-    return Response(
-        content=bytes(pdf_bytes),
+def _report_response(
+    req: AnalysisRequest, request: Request, digest: str, params: ParameterSnapshot, cache_control: str
+) -> Response:
+    etag = make_etag("report", req, params.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response = Response(
+        content=build_report_pdf(req, params),
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=WHR_Technical_Report.pdf"},
     )
+    set_cache_headers(response, etag, cache_control, location=_report_url(digest, params.version))
+    return response
+
+
+@router.post("/report")
+def generate_report(req: AnalysisRequest, request: Request):
+    """
+    Generate and return a downloadable PDF technical report.
+
+    The Content-Location header gives the cacheable GET form of this report.
+    """
+    return _report_response(req, request, _register_report(req), get_parameters(), CACHE_CONTROL_REVALIDATE)
+
+
+@router.post("/report/link", response_model=ReportLink)
+def link_report(req: AnalysisRequest):
+    """Register a report request and return its content-addressed GET URL without rendering it."""
+    digest = _register_report(req)
+    version = get_parameters().version
+    return ReportLink(content_hash=digest, parameter_version=version, url=_report_url(digest, version))
+
+
+@router.get("/report/{report_hash}")
+def get_report(report_hash: str, request: Request, v: Optional[str] = None):
+    """
+    Content-addressed PDF report, cacheable by browsers and intermediaries.
+
+    `v` pins the parameter version. A missing or outdated version redirects
+    to the current one, so a cached URL never changes content.
+    """
+    stored = get_analysis_store().get_report_request(report_hash)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown report hash; POST /report/link first")
+    params = get_parameters()
+    if v != params.version:
+        return RedirectResponse(
+            _report_url(report_hash, params.version),
+            status_code=307,
+            headers={"Cache-Control": CACHE_CONTROL_REVALIDATE},
+        )
+    req = AnalysisRequest.model_validate(stored)
+    return _report_response(req, request, report_hash, params, CACHE_CONTROL_SHARED)
+
+
+@router.get("/parameters", response_model=ParameterSet)
+def get_parameter_set():
+    """Return the active engine parameter tables and their version id."""
+    return get_parameters().to_dict()
+
+
+@router.post("/parameters/reload", response_model=ParameterSet)
+def reload_parameter_set():
+    """Reload the parameter file now instead of waiting for the change check."""
+    try:
+        return get_registry().reload().to_dict()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+def submit_job(req: JobSubmitRequest):
+    """
+    Run any analysis endpoint as a background job.
+
+    Returns immediately with the job id; poll GET /jobs/{id} and download
+    GET /jobs/{id}/result once it has succeeded.
+    """
+    try:
+        return get_job_manager().submit(req.kind.value, req.payload, req.priority)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str):
+    """Status and progress of a job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    """Download the result of a succeeded job (JSON or PDF)."""
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    result = manager.result(job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Job has no result (status: {job['status']})")
+    path, media_type = result
+    filename = "WHR_Technical_Report.pdf" if media_type == "application/pdf" else None
+    return FileResponse(path, media_type=media_type, filename=filename)
@@ -0,0 +1,194 @@
+"""
+Multi-stage cascade heat recovery.
+
+Real installations chain equipment from high to low grade — a waste heat
+boiler, then an economizer, then an air preheater — with each stage's gas
+outlet feeding the next stage's inlet. This module enumerates every ordered
+chain of the exchanger types in explorer.HX_TYPES together with every
+intermediate temperature split on a grid, and ranks the resulting
+cascades. The tail outlet is kept at or above the acid dew point.
+
+The search is a depth-first walk over (next stage type, inlet temperature),
+so totals for a shared prefix are computed once and extended, not rebuilt.
+Each stage is evaluated through a per-plant memo keyed on
+(stage type, T_in, T_out). The same stage/temperature pair reached through
+different chains is never recomputed.
+
+Stage costs follow the explorer's cost model: the plant's installation cost
+scaled by the exchanger factor and the six-tenths rule on duty, with the
+plant's own single-stage design as the reference duty.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple
+from .explorer import HX_TYPES, CAPEX_SCALING_EXPONENT
+from .parameters import ParameterSnapshot, FUEL_INDEX, get_parameters
+
+# Ranking keys: metric → True if larger is better
+RANK_KEYS = {
+    "payback_years": False,
+    "annual_savings": True,
+    "net_value_5yr": True,
+}
+
+# (capex, savings, co2, heat_kw) of one stage
+StageResult = Tuple[float, float, float, float]
+
+
+class CascadeEvaluator:
+    """Memoized stage evaluation for one plant under one parameter snapshot."""
+
+    def __init__(self, plant: dict, params: ParameterSnapshot):
+        base_delta = plant["flue_temp_in"] - plant["flue_temp_out"]
+        if base_delta <= 0:
+            raise ValueError("flue_temp_out must be below flue_temp_in to size the base design")
+        ef = params.emission_factors[FUEL_INDEX[plant["fuel_type"]]]
+        self._flow_cp = plant["flow_rate"] * params.cp_flue_gas
+        self._latent = params.latent_heat_steam
+        self._savings_per_steam = plant["operating_hours"] * plant["fuel_cost"]
+        self._co2_per_steam = plant["operating_hours"] * ef / 1000.0
+        self._base_capex = plant["installation_cost"]
+        self._base_delta = base_delta
+        self._memo: Dict[Tuple[int, float, float], StageResult] = {}
+
+    @property
+    def evaluations(self) -> int:
+        """Distinct stages evaluated so far."""
+        return len(self._memo)
+
+    def stage(self, hx_idx: int, temp_in: float, temp_out: float) -> StageResult:
+        key = (hx_idx, temp_in, temp_out)
+        result = self._memo.get(key)
+        if result is None:
+            hx = HX_TYPES[hx_idx]
+            delta = temp_in - temp_out
+            steam = self._flow_cp * delta / self._latent * hx.utilization
+            result = (
+                self._base_capex * hx.capex_factor * (delta / self._base_delta) ** CAPEX_SCALING_EXPONENT,
+                steam * self._savings_per_steam,
+                steam * self._co2_per_steam,
+                self._flow_cp * delta / 3600.0,
+            )
+            self._memo[key] = result
+        return result
+
+
+def temperature_grid(temp_in: float, temp_step: float, dew_point: float) -> List[float]:
+    """Stage outlet temperatures every temp_step below the inlet, down to the dew point (hottest first)."""
+    grid: List[float] = []
+    k = 1
+    while temp_in - k * temp_step >= dew_point:
+        grid.append(round(temp_in - k * temp_step, 6))
+        k += 1
+    return grid
+
+
+def count_cascades(grid_size: int, max_stages: int) -> int:
+    """
+    Upper bound on the cascades rank_cascades() enumerates over a grid.
+
+    A cascade of s stages picks s of the exchanger types (in order) and s
+    strictly decreasing outlet temperatures from the grid.
+    """
+    return sum(
+        math.comb(len(HX_TYPES), s) * math.comb(grid_size, s)
+        for s in range(1, min(max_stages, len(HX_TYPES)) + 1)
+    )
+
+
+def rank_cascades(
+    plant: dict,
+    temp_step: float = 10.0,
+    min_stage_delta_t: float = 10.0,
+    max_stages: int = 3,
+    rank_by: str = "payback_years",
+    top_k: int = 20,
+    params: Optional[ParameterSnapshot] = None,
+) -> dict:
+    """
+    Enumerate all valid cascades for one plant and return the top_k by rank_by.
+
+    Intermediate and tail temperatures lie on a grid of temp_step below the
+    inlet; every stage drops at least min_stage_delta_t and respects its
+    exchanger's minimum outlet temperature.
+    """
+    params = params or get_parameters()
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"Unsupported rank_by: {rank_by}")
+    larger_better = RANK_KEYS[rank_by]
+    evaluator = CascadeEvaluator(plant, params)
+    dew = params.dew_point_threshold
+    temp_in = plant["flue_temp_in"]
+
+    grid = temperature_grid(temp_in, temp_step, dew)
+
+    best: list = []  # min-heap of (score, seq, path, totals)
+    seq = itertools.count()
+    counted = 0
+
+    def consider(path: tuple, totals: tuple) -> None:
+        nonlocal counted
+        counted += 1
+        capex, savings = totals[0], totals[1]
+        if rank_by == "payback_years":
+            value = capex / savings if savings > 0 else float("inf")
+        elif rank_by == "annual_savings":
+            value = savings
+        else:
+            value = 5 * savings - capex
+        score = value if larger_better else -value
+        entry = (score, next(seq), path, totals)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        elif score > best[0][0]:
+            heapq.heapreplace(best, entry)
+
+    def extend(first_type: int, t_in: float, depth: int, path: tuple, totals: tuple) -> None:
+        for hx_idx in range(first_type, len(HX_TYPES)):
+            floor = max(dew, HX_TYPES[hx_idx].min_outlet_temp)
+            for t_out in grid:
+                if t_out > t_in - min_stage_delta_t:
+                    continue
+                if t_out < floor:
+                    break
+                stage = evaluator.stage(hx_idx, t_in, t_out)
+                new_totals = tuple(a + b for a, b in zip(totals, stage))
+                new_path = path + ((hx_idx, t_in, t_out),)
+                consider(new_path, new_totals)
+                if depth + 1 < max_stages:
+                    extend(hx_idx + 1, t_out, depth + 1, new_path, new_totals)
+
+    extend(0, temp_in, 0, (), (0.0, 0.0, 0.0, 0.0))
+
+    ranked = sorted(best, key=lambda e: e[0], reverse=True)
+    cascades = []
+    for _, _, path, (capex, savings, co2, heat) in ranked:
+        stages = []
+        for hx_idx, t_in, t_out in path:
+            s_capex, s_savings, _, s_heat = evaluator.stage(hx_idx, t_in, t_out)
+            stages.append({
+                "stage": HX_TYPES[hx_idx].name,
+                "temp_in": t_in,
+                "temp_out": t_out,
+                "heat_recovered_kW": round(s_heat, 2),
+                "capex": round(s_capex, 2),
+                "annual_savings": round(s_savings, 2),
+            })
+        cascades.append({
+            "stages": stages,
+            "capex": round(capex, 2),
+            "annual_savings": round(savings, 2),
+            "co2_reduction_tons": round(co2, 2),
+            "heat_recovered_kW": round(heat, 2),
+            "payback_years": round(capex / savings, 2) if savings > 0 else 999.0,
+            "net_value_5yr": round(5 * savings - capex, 2),
+        })
+
+    return {
+        "plant_id": plant.get("plant_id"),
+        "configurations_evaluated": counted,
+        "stage_evaluations": evaluator.evaluations,
+        "cascades": cascades,
+    }
@@ -0,0 +1,185 @@
+"""
+Pareto-frontier design explorer.
+
+Sweeps the design space of a plant — outlet temperature × heat-exchanger
+type × material class — and keeps only the non-dominated designs over four
+objectives:
+
+  - capex               (minimise)
+  - annual savings      (maximise)
+  - CO₂ avoided         (maximise)
+  - corrosion risk      (minimise)
+
+Within one plant the fuel, fuel cost and hours are fixed, so CO₂ avoided and
+annual savings are both proportional to the useful steam recovered. They
+order designs identically, and dominance is decided on
+(capex, savings, risk). That 3-objective front is found with a sweep in
+O(n log n): sort by capex, then test each design against a 2-D staircase of
+(risk, savings) kept in bisectable lists.
+
+Cost model (six-tenths rule):
+  capex = base_capex × type_factor × material_factor × (Q / Q_base)^0.6
+where Q_base is the heat recovered at the plant's own outlet temperature.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .parameters import ParameterSnapshot, FUEL_INDEX, get_parameters
+
+
+class ExchangerType(NamedTuple):
+    name: str
+    capex_factor: float    # relative to the user's installation cost
+    utilization: float     # fraction of recovered heat that displaces fuel
+    min_outlet_temp: float # lowest gas outlet temperature the unit can reach (°C)
+
+
+class MaterialClass(NamedTuple):
+    name: str
+    capex_factor: float
+    dew_tolerance: float   # °C below the safe margin the material tolerates
+
+
+HX_TYPES: Tuple[ExchangerType, ...] = (
+    ExchangerType("Waste Heat Boiler", 1.35, 1.00, 180.0),
+    ExchangerType("Economizer", 1.00, 0.95, 0.0),
+    ExchangerType("Air Preheater", 0.80, 0.85, 0.0),
+)
+
+MATERIALS: Tuple[MaterialClass, ...] = (
+    MaterialClass("Carbon Steel", 1.00, 0.0),
+    MaterialClass("Corten Steel", 1.15, 10.0),
+    MaterialClass("Stainless 316L", 1.45, 25.0),
+    MaterialClass("Glass-Lined", 1.80, 50.0),
+)
+
+# Six-tenths scaling exponent for equipment cost vs duty
+CAPEX_SCALING_EXPONENT = 0.6
+
+# Safety margin above the dew point (matches recommend_heat_exchanger) and
+# the span below it over which corrosion risk ramps from 0 to 1 (°C)
+DEW_MARGIN = 10.0
+RISK_SPAN = 50.0
+
+
+def corrosion_risk(temp_out: float, material: MaterialClass, dew_point: float) -> float:
+    """0 (safe) … 1 (severe) acid-corrosion risk at the cold end."""
+    shortfall = dew_point + DEW_MARGIN - material.dew_tolerance - temp_out
+    if shortfall <= 0:
+        return 0.0
+    return min(1.0, shortfall / RISK_SPAN)
+
+
+def candidate_temps(temp_in: float, lowest: float, step: float) -> List[float]:
+    """Outlet temperatures from just below T_in down to `lowest`, every `step` °C."""
+    temps = []
+    t = temp_in - step
+    while t >= lowest:
+        temps.append(round(t, 6))
+        t -= step
+    return temps
+
+
+def count_candidates(temp_in: float, lowest: float, step: float) -> int:
+    """Upper bound on the number of designs evaluate_designs() will generate."""
+    n_temps = max(0, int((temp_in - lowest) // step))
+    return n_temps * len(HX_TYPES) * len(MATERIALS)
+
+
+def evaluate_designs(
+    plant: dict,
+    temp_step: float,
+    min_outlet_temp: float,
+    params: ParameterSnapshot,
+) -> List[Tuple[float, float, float, float, float, int, int]]:
+    """
+    All candidate designs for one plant as
+    (capex, savings, co2, risk, temp_out, hx_index, material_index) tuples.
+    """
+    temp_in = plant["flue_temp_in"]
+    base_delta = temp_in - plant["flue_temp_out"]
+    if base_delta <= 0:
+        raise ValueError("flue_temp_out must be below flue_temp_in to size the base design")
+
+    ef = params.emission_factors[FUEL_INDEX[plant["fuel_type"]]]
+    steam_per_k = plant["flow_rate"] * params.cp_flue_gas / params.latent_heat_steam
+    hours = plant["operating_hours"]
+    savings_per_steam = hours * plant["fuel_cost"]
+    co2_per_steam = hours * ef / 1000.0
+    base_capex = plant["installation_cost"]
+    dew = params.dew_point_threshold
+
+    designs = []
+    for temp_out in candidate_temps(temp_in, min_outlet_temp, temp_step):
+        delta = temp_in - temp_out
+        steam = steam_per_k * delta
+        scale = (delta / base_delta) ** CAPEX_SCALING_EXPONENT
+        risks = [corrosion_risk(temp_out, m, dew) for m in MATERIALS]
+        for hx_idx, hx in enumerate(HX_TYPES):
+            if temp_out < hx.min_outlet_temp:
+                continue
+            useful = steam * hx.utilization
+            savings = useful * savings_per_steam
+            co2 = useful * co2_per_steam
+            hx_capex = base_capex * hx.capex_factor * scale
+            for mat_idx, material in enumerate(MATERIALS):
+                designs.append((
+                    hx_capex * material.capex_factor, savings, co2, risks[mat_idx],
+                    temp_out, hx_idx, mat_idx,
+                ))
+    return designs
+
+
+def pareto_front(designs: List[tuple]) -> List[tuple]:
+    """
+    Non-dominated subset of (capex, savings, _, risk, …) tuples, ordered by capex.
+
+    Minimises capex and risk, maximises savings. Exact duplicates are
+    collapsed to a single design. O(n log n).
+    """
+    designs = sorted(designs, key=lambda d: (d[0], -d[1], d[3]))
+    # Staircase of kept designs: risks ascending, savings strictly ascending.
+    # A design is dominated iff the staircase entry with the largest
+    # risk ≤ its risk already has savings ≥ its savings.
+    stair_risk: List[float] = []
+    stair_savings: List[float] = []
+    front = []
+    for d in designs:
+        savings, risk = d[1], d[3]
+        i = bisect_right(stair_risk, risk)
+        if i and stair_savings[i - 1] >= savings:
+            continue
+        front.append(d)
+        # Drop staircase entries now dominated in (risk, savings)
+        if i and stair_risk[i - 1] == risk:
+            i -= 1
+        j = i
+        while j < len(stair_risk) and stair_savings[j] <= savings:
+            j += 1
+        stair_risk[i:j] = [risk]
+        stair_savings[i:j] = [savings]
+    return front
+
+
+def explore_plant(
+    plant: dict,
+    temp_step: float = 1.0,
+    min_outlet_temp: float = 60.0,
+    params: Optional[ParameterSnapshot] = None,
+) -> Dict[str, list]:
+    """Pareto frontier for one plant, as column arrays sorted by capex."""
+    params = params or get_parameters()
+    designs = evaluate_designs(plant, temp_step, min_outlet_temp, params)
+    front = pareto_front(designs)
+    return {
+        "plant_id": plant.get("plant_id"),
+        "candidates": len(designs),
+        "flue_temp_out": [d[4] for d in front],
+        "hx_type": [d[5] for d in front],
+        "material": [d[6] for d in front],
+        "capex": [round(d[0], 2) for d in front],
+        "annual_savings": [round(d[1], 2) for d in front],
+        "co2_reduction_tons": [round(d[2], 2) for d in front],
+        "corrosion_risk": [round(d[3], 3) for d in front],
+        "payback_years": [round(d[0] / d[1], 2) if d[1] > 0 else 999.0 for d in front],
+    }
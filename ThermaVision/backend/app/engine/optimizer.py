@@ -9,25 +9,31 @@ Provides:
   - Climate equivalence calculations
 """
 
-from typing import List, Dict
-from .calculator import run_scenario, check_dew_point, DEW_POINT_THRESHOLD
+from typing import List, Dict, Optional
+from .calculator import run_scenario, check_dew_point
+from .parameters import ParameterSnapshot, get_parameters
 
 
-def recommend_heat_exchanger(temp_in: float, temp_out: float) -> dict:
+def recommend_heat_exchanger(
+    temp_in: float,
+    temp_out: float,
+    params: Optional[ParameterSnapshot] = None,
+) -> dict:
     """
     Suggest heat exchanger type based on temperature range.
 
-    Rules (industrial heuristics):
+    Rules (industrial heuristics, thresholds from the parameter tables):
       - ΔT > 150 °C  → Waste Heat Boiler
       - ΔT > 80 °C   → Economizer
       - ΔT ≤ 80 °C   → Air Preheater
     """
+    params = params or get_parameters()
     delta = temp_in - temp_out
 
-    if delta > 150:
+    if delta > params.boiler_delta_t:
         hx_type = "Waste Heat Boiler"
         improvement = "High-grade heat recovery — potential for direct steam generation"
-    elif delta > 80:
+    elif delta > params.economizer_delta_t:
         hx_type = "Economizer"
         improvement = "Medium-grade heat recovery — ideal for boiler feed-water preheating"
     else:
@@ -35,9 +41,9 @@ def recommend_heat_exchanger(temp_in: float, temp_out: float) -> dict:
         improvement = "Low-grade heat recovery — suitable for combustion air preheating"
 
     # Optimal exit temp: as low as safely above dew point
-    optimal_exit = max(temp_out, DEW_POINT_THRESHOLD + 10)
+    optimal_exit = max(temp_out, params.dew_point_threshold + 10)
 
-    dew_flag, dew_msg = check_dew_point(temp_out)
+    dew_flag, dew_msg = check_dew_point(temp_out, params)
 
     return {
         "heat_exchanger_type": hx_type,
@@ -56,6 +62,7 @@ def generate_scenarios(
     fuel_cost: float,
     operating_hours: float,
     installation_cost: float,
+    params: Optional[ParameterSnapshot] = None,
 ) -> List[Dict]:
     """
     Generate three scenarios for comparison:
@@ -64,6 +71,7 @@ def generate_scenarios(
     2. Improved Case  — outlet temp lowered by 15 °C (capped at dew point)
     3. Optimized Case — outlet temp lowered by 30 °C (capped at dew point + 5)
     """
+    params = params or get_parameters()
     scenarios = []
 
     # Base
@@ -71,29 +79,29 @@ def generate_scenarios(
         run_scenario(
             flow_rate, temp_in, temp_out,
             fuel_type, fuel_cost, operating_hours, installation_cost,
-            label="Base Case",
+            label="Base Case", params=params,
         )
     )
 
     # Improved
-    improved_out = max(temp_out - 15, DEW_POINT_THRESHOLD)
+    improved_out = max(temp_out - 15, params.dew_point_threshold)
     scenarios.append(
         run_scenario(
             flow_rate, temp_in, improved_out,
             fuel_type, fuel_cost, operating_hours,
             installation_cost * 1.10,  # 10% higher capex for better HX
-            label="Improved Case",
+            label="Improved Case", params=params,
         )
     )
 
     # Optimized
-    optimized_out = max(temp_out - 30, DEW_POINT_THRESHOLD + 5)
+    optimized_out = max(temp_out - 30, params.dew_point_threshold + 5)
     scenarios.append(
         run_scenario(
             flow_rate, temp_in, optimized_out,
             fuel_type, fuel_cost, operating_hours,
             installation_cost * 1.25,  # 25% higher capex for premium HX
-            label="Optimized Case",
+            label="Optimized Case", params=params,
         )
     )
 
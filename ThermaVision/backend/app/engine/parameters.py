@@ -0,0 +1,225 @@
+"""
+Versioned, hot-reloadable engineering parameter tables.
+
+Emission factors, thermophysical constants and the
+design thresholds used by the engine are loaded from a local JSON file
+(backend/parameters.json, override with THERMAVISION_PARAMS_PATH). Each load
+produces an immutable ParameterSnapshot with a content-derived version id;
+the registry swaps snapshots by reference, so a request that grabs one
+snapshot up front sees consistent values even if a reload happens mid-way.
+
+Per-fuel tables are stored as tuples ordered by FUEL_ORDER. Batch code maps a
+fuel to its index once and then indexes the tuple directly.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+# Backend root (…/backend)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_PARAMS_PATH = os.path.join(BASE_DIR, "parameters.json")
+
+# How often (seconds) current() re-checks the file for changes
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Canonical fuel ordering for the per-fuel tables (matches FuelType values)
+FUEL_ORDER: Tuple[str, ...] = ("Coal", "Natural Gas", "Bagasse", "Fuel Oil", "Biomass")
+FUEL_INDEX: Dict[str, int] = {fuel: i for i, fuel in enumerate(FUEL_ORDER)}
+
+# Built-in defaults, used for anything the parameter file does not override
+DEFAULT_VALUES = {
+    # Specific heat of flue gas (kJ/kg·K) – standard approximation
+    "cp_flue_gas": 1.0,
+    # Latent heat of steam vaporisation (kJ/kg) at ~100 °C
+    "latent_heat_steam": 2257.0,
+    # Dew-point threshold for acid-gas condensation (°C)
+    "dew_point_threshold": 120.0,
+    # ΔT above which a waste heat boiler / economizer is recommended (°C)
+    "boiler_delta_t": 150.0,
+    "economizer_delta_t": 80.0,
+    # CO₂ emission factors (kg CO₂ per kg fuel burned)
+    "emission_factors": {
+        "Coal": 2.40,
+        "Natural Gas": 2.75,
+        "Bagasse": 0.0,
+        "Fuel Oil": 3.15,
+        "Biomass": 0.10,
+    },
+}
+
+_SCALARS = ("cp_flue_gas", "latent_heat_steam", "dew_point_threshold", "boiler_delta_t", "economizer_delta_t")
+_FUEL_TABLES = ("emission_factors",)
+
+
+@dataclass(frozen=True)
+class ParameterSnapshot:
+    """An immutable, versioned set of engine parameters."""
+
+    version: str
+    cp_flue_gas: float
+    latent_heat_steam: float
+    dew_point_threshold: float
+    boiler_delta_t: float
+    economizer_delta_t: float
+    emission_factors: Tuple[float, ...]  # indexed by FUEL_INDEX
+
+    def emission_factor(self, fuel_type: str) -> float:
+        """Emission factor for a fuel name (0.0 for unknown fuels)."""
+        idx = FUEL_INDEX.get(fuel_type)
+        return self.emission_factors[idx] if idx is not None else 0.0
+
+    def to_dict(self) -> dict:
+        """Human-readable form with the per-fuel tables keyed by fuel name."""
+        data = asdict(self)
+        for table in _FUEL_TABLES:
+            data[table] = dict(zip(FUEL_ORDER, data[table]))
+        return data
+
+
+def _is_finite_number(value) -> bool:
+    # json.load accepts bare NaN / Infinity, which slip past range comparisons
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def build_snapshot(overrides: Optional[dict] = None) -> ParameterSnapshot:
+    """
+    Merge overrides onto the defaults, validate, and freeze into a snapshot.
+
+    Raises ValueError for unknown keys, unknown fuels, non-numeric or
+    non-finite values, or an economizer threshold that is not below the
+    boiler threshold.
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(DEFAULT_VALUES)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    values: Dict[str, object] = {}
+    for key in _SCALARS:
+        value = overrides.get(key, DEFAULT_VALUES[key])
+        if not _is_finite_number(value) or value <= 0:
+            raise ValueError(f"'{key}' must be a positive number")
+        values[key] = float(value)
+    if values["economizer_delta_t"] >= values["boiler_delta_t"]:
+        raise ValueError("'economizer_delta_t' must be below 'boiler_delta_t'")
+
+    for table in _FUEL_TABLES:
+        merged = dict(DEFAULT_VALUES[table])
+        extra = overrides.get(table, {})
+        if not isinstance(extra, dict):
+            raise ValueError(f"'{table}' must be an object keyed by fuel type")
+        for fuel, value in extra.items():
+            if fuel not in FUEL_INDEX:
+                raise ValueError(f"Unknown fuel type in '{table}': {fuel}")
+            if not _is_finite_number(value) or value < 0:
+                raise ValueError(f"'{table}.{fuel}' must be a non-negative number")
+            merged[fuel] = float(value)
+        values[table] = tuple(merged[fuel] for fuel in FUEL_ORDER)
+
+    # Version is derived from the effective values, so identical tables
+    # produce identical ids on every worker.
+    canonical = json.dumps(
+        {k: list(v) if isinstance(v, tuple) else v for k, v in values.items()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    version = hashlib.sha256(canonical.encode()).hexdigest()[:12]
+    return ParameterSnapshot(version=version, **values)
+
+
+# Placeholder for ParameterRegistry._rejected_stamp; no real file has this stamp
+_NOT_REJECTED = (-1, -1)
+
+
+class ParameterRegistry:
+    """
+    Holds the current ParameterSnapshot and reloads it when the file changes.
+
+    current() is cheap: it returns the held reference and only stats the file
+    every RELOAD_CHECK_INTERVAL seconds. A file that is missing or fails
+    validation during an automatic reload is reported once and the previous
+    snapshot is kept; the built-in defaults are only used when there is no
+    file on the first load.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ParameterSnapshot] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        # Stamp of the last file rejected by current(); None means "file missing"
+        self._rejected_stamp: Optional[Tuple[int, int]] = _NOT_REJECTED
+        self._next_check = 0.0
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.getenv("THERMAVISION_PARAMS_PATH", DEFAULT_PARAMS_PATH)
+        return self._path
+
+    def _stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def reload(self) -> ParameterSnapshot:
+        """Load the file now and swap in the new snapshot. Raises ValueError if invalid."""
+        with self._lock:
+            stamp = self._stamp()
+            if stamp is None:
+                if self._snapshot is not None:
+                    raise ValueError(f"Parameter file not found: {self.path}")
+                overrides = {}
+            else:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        overrides = json.load(f)
+                except (OSError, json.JSONDecodeError) as exc:
+                    raise ValueError(f"Cannot read parameter file: {exc}") from exc
+                if not isinstance(overrides, dict):
+                    raise ValueError("Parameter file must contain a JSON object")
+            snapshot = build_snapshot(overrides)
+            self._file_stamp = stamp
+            self._rejected_stamp = _NOT_REJECTED
+            self._next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+            self._snapshot = snapshot
+            return snapshot
+
+    def current(self) -> ParameterSnapshot:
+        """The active snapshot, reloading first if the file has changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+        stamp = self._stamp()
+        if snapshot is None or (stamp != self._file_stamp and stamp != self._rejected_stamp):
+            try:
+                return self.reload()
+            except ValueError as exc:
+                if snapshot is None:
+                    raise
+                # Report a bad or missing file once; it is retried when it changes again
+                self._rejected_stamp = stamp
+                print(f"[parameters] keeping version {snapshot.version}: {exc}")
+        self._next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+        return snapshot
+
+
+_registry = ParameterRegistry()
+
+
+def get_registry() -> ParameterRegistry:
+    """Process-wide parameter registry."""
+    return _registry
+
+
+def get_parameters() -> ParameterSnapshot:
+    """Shortcut for the current parameter snapshot."""
+    return _registry.current()
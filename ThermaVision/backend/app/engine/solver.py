@@ -0,0 +1,263 @@
+"""
+Goal-seek (inverse) solver.
+
+Given a target value for one output metric and one free input variable,
+find the input value that hits the target while every other input stays as
+supplied. The calculator formulas are products and quotients of the inputs:
+
+  steam   = flow × Cp × (T_in − T_out) / latent_heat
+  savings = steam × hours × fuel_cost
+  payback = capex / savings
+  co2     = steam × hours × emission_factor / 1000
+  eff     = 100 × (T_in − T_out) / T_in
+
+so most (metric, variable) pairs are inverted in closed form. Pairs without
+an inverse are solved by bracketed root-finding over the variable's bounds.
+Solutions are checked against the AnalysisRequest schema bounds and, for the
+outlet temperature, the acid dew point.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+from .calculator import run_scenario
+from .parameters import ParameterSnapshot, FUEL_INDEX, get_parameters
+
+FREE_VARIABLES = (
+    "flue_temp_out",
+    "flue_temp_in",
+    "flow_rate",
+    "fuel_cost",
+    "operating_hours",
+    "installation_cost",
+)
+
+# Which inputs each metric depends on
+_DEPENDS: Dict[str, Tuple[str, ...]] = {
+    "steam_saved_kg_hr": ("flue_temp_out", "flue_temp_in", "flow_rate"),
+    "heat_recovered_kW": ("flue_temp_out", "flue_temp_in", "flow_rate"),
+    "annual_savings": ("flue_temp_out", "flue_temp_in", "flow_rate", "fuel_cost", "operating_hours"),
+    "co2_reduction_tons": ("flue_temp_out", "flue_temp_in", "flow_rate", "operating_hours"),
+    "payback_years": FREE_VARIABLES,
+    "efficiency_gain_pct": ("flue_temp_out", "flue_temp_in"),
+}
+
+# Bisection settings for the bracketed fallback
+_MAX_ITER = 200
+_REL_TOL = 1e-10
+
+
+def schema_bounds(model) -> Dict[str, Tuple[float, float]]:
+    """(lower, upper) for every numeric field of a Pydantic model, from its gt/ge/lt/le metadata."""
+    bounds = {}
+    for name, field in model.model_fields.items():
+        lo, hi = -math.inf, math.inf
+        for meta in field.metadata:
+            for attr in ("gt", "ge"):
+                if getattr(meta, attr, None) is not None:
+                    lo = float(getattr(meta, attr))
+            for attr in ("lt", "le"):
+                if getattr(meta, attr, None) is not None:
+                    hi = float(getattr(meta, attr))
+        bounds[name] = (lo, hi)
+    return bounds
+
+
+def _steam(v: dict, p: ParameterSnapshot) -> float:
+    return v["flow_rate"] * p.cp_flue_gas * (v["flue_temp_in"] - v["flue_temp_out"]) / p.latent_heat_steam
+
+
+def evaluate(v: dict, metric: str, p: ParameterSnapshot, ef: float) -> float:
+    """Unrounded forward model for one metric (ef = emission factor of the plant's fuel)."""
+    if metric == "efficiency_gain_pct":
+        return 100.0 * (v["flue_temp_in"] - v["flue_temp_out"]) / v["flue_temp_in"]
+    steam = _steam(v, p)
+    if metric == "steam_saved_kg_hr":
+        return steam
+    if metric == "heat_recovered_kW":
+        return steam * p.latent_heat_steam / 3600.0
+    if metric == "co2_reduction_tons":
+        return steam * v["operating_hours"] * ef / 1000.0
+    savings = steam * v["operating_hours"] * v["fuel_cost"]
+    if metric == "annual_savings":
+        return savings
+    return v["installation_cost"] / savings if savings > 0 else math.inf
+
+
+def _required_steam(v: dict, metric: str, target: float, p: ParameterSnapshot, ef: float) -> float:
+    """Steam rate (kg/hr) needed to hit the target, other inputs fixed."""
+    if metric == "steam_saved_kg_hr":
+        return target
+    if metric == "heat_recovered_kW":
+        return target * 3600.0 / p.latent_heat_steam
+    if metric == "co2_reduction_tons":
+        return target * 1000.0 / (v["operating_hours"] * ef) if ef > 0 else math.nan
+    if metric == "annual_savings":
+        return target / (v["operating_hours"] * v["fuel_cost"])
+    # payback_years
+    return v["installation_cost"] / (target * v["operating_hours"] * v["fuel_cost"])
+
+
+def closed_form(v: dict, metric: str, var: str, target: float, p: ParameterSnapshot, ef: float) -> Optional[float]:
+    """
+    Exact inverse for (metric, var), or None if no closed form is implemented.
+
+    Returns NaN when no value of var can reach the target.
+    """
+    if metric == "efficiency_gain_pct":
+        # eff = 100·(1 − T_out/T_in); the T_in branch is left to the root finder
+        if var == "flue_temp_out":
+            return v["flue_temp_in"] * (1.0 - target / 100.0)
+        return None
+
+    if var in ("flow_rate", "flue_temp_in", "flue_temp_out"):
+        steam = _required_steam(v, metric, target, p, ef)
+        if math.isnan(steam):
+            return math.nan
+        if var == "flow_rate":
+            delta_t = v["flue_temp_in"] - v["flue_temp_out"]
+            return steam * p.latent_heat_steam / (p.cp_flue_gas * delta_t) if delta_t > 0 else math.nan
+        delta_t = steam * p.latent_heat_steam / (p.cp_flue_gas * v["flow_rate"])
+        return v["flue_temp_out"] + delta_t if var == "flue_temp_in" else v["flue_temp_in"] - delta_t
+
+    steam = _steam(v, p)
+    if steam <= 0:
+        return math.nan
+    if var == "operating_hours":
+        if metric == "annual_savings":
+            return target / (steam * v["fuel_cost"])
+        if metric == "co2_reduction_tons":
+            return target * 1000.0 / (steam * ef) if ef > 0 else math.nan
+        return v["installation_cost"] / (target * steam * v["fuel_cost"])
+    if var == "fuel_cost":
+        if metric == "annual_savings":
+            return target / (steam * v["operating_hours"])
+        return v["installation_cost"] / (target * steam * v["operating_hours"])
+    # installation_cost — only payback depends on it
+    return target * steam * v["operating_hours"] * v["fuel_cost"]
+
+
+def bracketed_root(f: Callable[[float], float], lo: float, hi: float) -> Optional[float]:
+    """Bisection for f(x) = 0 on [lo, hi]; None if the bracket holds no sign change."""
+    f_lo, f_hi = f(lo), f(hi)
+    if f_lo == 0:
+        return lo
+    if f_hi == 0:
+        return hi
+    if (f_lo > 0) == (f_hi > 0):
+        return None
+    for _ in range(_MAX_ITER):
+        mid = 0.5 * (lo + hi)
+        f_mid = f(mid)
+        if f_mid == 0 or (hi - lo) <= _REL_TOL * max(1.0, abs(mid)):
+            return mid
+        if (f_mid > 0) == (f_lo > 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def variable_bounds(
+    v: dict,
+    var: str,
+    bounds: Dict[str, Tuple[float, float]],
+    p: ParameterSnapshot,
+    respect_dew_point: bool,
+) -> Tuple[float, float]:
+    """Feasible interval for the free variable given the other inputs."""
+    lo, hi = bounds[var]
+    if var == "flue_temp_out":
+        hi = min(hi, v["flue_temp_in"])
+        if respect_dew_point:
+            lo = max(lo, p.dew_point_threshold)
+    elif var == "flue_temp_in":
+        lo = max(lo, v["flue_temp_out"])
+    return max(lo, 0.0), hi
+
+
+def _finite_upper(f: Callable[[float], float], lo: float, hi: float) -> float:
+    """Replace an infinite upper bound by one that brackets a sign change (if any)."""
+    if not math.isinf(hi):
+        return hi
+    hi = max(1.0, 2.0 * lo)
+    f_lo = f(lo)
+    for _ in range(200):
+        if (f(hi) > 0) != (f_lo > 0):
+            break
+        hi *= 2.0
+    return hi
+
+
+def solve_plant(
+    v: dict,
+    metric: str,
+    var: str,
+    target: float,
+    p: ParameterSnapshot,
+    bounds: Dict[str, Tuple[float, float]],
+    respect_dew_point: bool = True,
+) -> dict:
+    """Solve one plant. Returns the required value, method and feasibility."""
+    ef = p.emission_factors[FUEL_INDEX[v["fuel_type"]]] if v["fuel_type"] in FUEL_INDEX else 0.0
+    result = {"required_value": None, "feasible": False, "method": None, "achieved": None, "message": None}
+
+    if var not in _DEPENDS[metric]:
+        result["message"] = f"{metric} does not depend on {var}"
+        return result
+
+    lo, hi = variable_bounds(v, var, bounds, p, respect_dew_point)
+    value = closed_form(v, metric, var, target, p, ef)
+    if value is not None:
+        result["method"] = "closed_form"
+    else:
+        result["method"] = "bracketed"
+
+        def f(x: float) -> float:
+            return evaluate({**v, var: x}, metric, p, ef) - target
+
+        eps = 1e-9 * max(1.0, abs(lo))
+        value = bracketed_root(f, lo + eps, _finite_upper(f, lo + eps, hi))
+        if value is None:
+            result["message"] = f"Target is not reachable for {var} within [{lo:g}, {hi:g}]"
+            return result
+
+    if math.isnan(value) or math.isinf(value):
+        result["message"] = "No finite value of the variable reaches the target"
+        return result
+
+    result["required_value"] = round(value, 4)
+    if value < lo or value > hi:
+        result["message"] = f"Required {var} = {value:,.4g} lies outside the feasible range [{lo:g}, {hi:g}]"
+        return result
+
+    solved = {**v, var: value}
+    if respect_dew_point and solved["flue_temp_out"] < p.dew_point_threshold:
+        # A fixed outlet below the dew point is not rescued by solving another input
+        result["message"] = (
+            f"Outlet temperature {solved['flue_temp_out']:g}°C is below the acid dew point "
+            f"({p.dew_point_threshold:g}°C)"
+        )
+        return result
+
+    scenario = run_scenario(
+        solved["flow_rate"], solved["flue_temp_in"], solved["flue_temp_out"],
+        solved["fuel_type"], solved["fuel_cost"], solved["operating_hours"],
+        solved["installation_cost"], params=p,
+    )
+    result["feasible"] = True
+    result["achieved"] = scenario[metric]
+    return result
+
+
+def solve_fleet(
+    plants: List[dict],
+    metric: str,
+    var: str,
+    target: float,
+    bounds: Dict[str, Tuple[float, float]],
+    respect_dew_point: bool = True,
+    params: Optional[ParameterSnapshot] = None,
+) -> List[dict]:
+    """Solve the same goal for every plant with one parameter snapshot."""
+    p = params or get_parameters()
+    return [solve_plant(v, metric, var, target, p, bounds, respect_dew_point) for v in plants]
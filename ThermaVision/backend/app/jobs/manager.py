@@ -0,0 +1,335 @@
+"""
+Background job manager.
+
+Long-running work (large fleet analyses, design sweeps, PDF reports) is
+submitted as a job, which returns an id at once. Jobs wait in a bounded
+priority queue. A few runner threads feed their chunks to a process pool.
+Job state is kept in the JobStore and results are written to disk, where
+they expire after RESULT_TTL seconds.
+
+Cancellation is cooperative: a running job stops submitting work and drops
+its result, but a chunk already executing in a worker runs to completion.
+If a worker process dies, the pool is replaced and the affected jobs are
+requeued.
+"""
+
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+from ..engine.parameters import get_parameters
+from ..storage.analysis_store import get_analysis_store
+from ..storage.job_store import (
+    JobStore,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    FAILED,
+    CANCELLED,
+)
+from .tasks import JOB_KINDS, validate_payload, split_payload, merge_results, run_chunk, stored_analyses
+
+# Queue and pool sizing
+MAX_QUEUED_JOBS = 100
+CONCURRENT_JOBS = 2
+DEFAULT_WORKERS = max(2, os.cpu_count() or 2)
+
+# Finished results are kept for a day; expired ones are swept every 10 minutes
+RESULT_TTL = 24 * 3600
+CLEANUP_INTERVAL = 600
+
+# How often a running job re-checks for cancellation (seconds)
+POLL_INTERVAL = 0.25
+
+# Times a job is requeued after its worker process died before it is marked failed
+MAX_POOL_RESTARTS = 2
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue already holds MAX_QUEUED_JOBS jobs."""
+
+
+class JobManager:
+    """Priority job queue backed by a process pool and a durable JobStore."""
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        result_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queued: int = MAX_QUEUED_JOBS,
+    ):
+        self._store = store
+        self._result_dir = result_dir
+        self._max_workers = max_workers or int(os.getenv("THERMAVISION_JOB_WORKERS", DEFAULT_WORKERS))
+        self._max_queued = max_queued
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._cancelled: set = set()  # running jobs cancelled by the user
+        self._restarts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._threads: list = []
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore()
+        return self._store
+
+    @property
+    def result_dir(self) -> str:
+        if self._result_dir is None:
+            self._result_dir = os.path.join(os.path.dirname(self.store.path), "jobs")
+        return self._result_dir
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the pool and runner threads, and requeue persisted jobs (idempotent)."""
+        with self._cond:
+            if self._pool is not None:
+                return
+            os.makedirs(self.result_dir, exist_ok=True)
+            self._stop.clear()
+            self._pool = self._new_pool()
+            for job in self.store.recover():
+                self._push(job["id"], job["priority"])
+        self._cleanup()
+        self._threads = [
+            threading.Thread(target=self._run_loop, name=f"job-runner-{i}", daemon=True)
+            for i in range(CONCURRENT_JOBS)
+        ]
+        self._threads.append(threading.Thread(target=self._cleanup_loop, name="job-janitor", daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def shutdown(self) -> None:
+        """Stop accepting work. Interrupted jobs are requeued on the next start()."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+            pool, self._pool = self._pool, None
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, payload: dict, priority: int = 0) -> dict:
+        """
+        Validate and enqueue a job. Higher priority runs first.
+
+        Raises KeyError for an unknown kind, pydantic.ValidationError for a bad
+        payload and QueueFullError when the queue is at capacity.
+        """
+        if kind not in JOB_KINDS:
+            raise KeyError(kind)
+        payload = validate_payload(kind, payload)
+        self.start()
+        with self._cond:
+            if self.store.count(QUEUED) >= self._max_queued:
+                raise QueueFullError(f"Job queue is full ({self._max_queued} jobs waiting)")
+            job = self.store.create(kind, payload, priority)
+            self._push(job["id"], priority)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a queued or running job; finished jobs are returned unchanged.
+
+        A queued job never starts. A running job stops between chunks; the
+        chunk currently executing in a worker finishes and is discarded.
+        """
+        fields = dict(status=CANCELLED, finished_at=time.time(), expires_at=time.time() + RESULT_TTL)
+        # Try QUEUED first: a job that starts in between is caught as RUNNING
+        if not self.store.update(job_id, only_if_status=(QUEUED,), **fields):
+            with self._cond:
+                if self.store.update(job_id, only_if_status=(RUNNING,), **fields):
+                    self._cancelled.add(job_id)
+        return self.store.get(job_id)
+
+    def result(self, job_id: str) -> Optional[Tuple[str, str]]:
+        """(path, media_type) of a succeeded job's result, or None."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] != SUCCEEDED or not job["result_path"]:
+            return None
+        if not os.path.exists(job["result_path"]):
+            return None
+        return job["result_path"], job["media_type"]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _push(self, job_id: str, priority: int) -> None:
+        # Caller holds self._cond
+        heapq.heappush(self._heap, (-priority, next(self._seq), job_id))
+        self._cond.notify()
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._heap and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                _, _, job_id = heapq.heappop(self._heap)
+            job = self.store.get(job_id)
+            if job is None or job["status"] != QUEUED:
+                continue  # cancelled while waiting
+            self._execute(job)
+
+    def _execute(self, job: dict) -> None:
+        job_id, kind = job["id"], job["kind"]
+        params = get_parameters()
+        if not self.store.update(
+            job_id, only_if_status=(QUEUED,),
+            status=RUNNING, started_at=time.time(), progress=0.0,
+            parameter_version=params.version,
+        ):
+            return
+
+        chunks = split_payload(kind, job["payload"])
+        parts: list = [None] * len(chunks)
+        pending = iter(enumerate(chunks))
+        in_flight: Dict[Future, Tuple[int, ProcessPoolExecutor]] = {}
+        done = 0
+        requeued = False
+        pool: Optional[ProcessPoolExecutor] = None  # pool of the submit/result in progress
+        try:
+            while True:
+                while len(in_flight) < self._max_workers:
+                    nxt = next(pending, None)
+                    if nxt is None:
+                        break
+                    pool = self._pool
+                    if pool is None:
+                        return  # shutting down; recover() requeues the job
+                    in_flight[pool.submit(run_chunk, kind, nxt[1], params)] = (nxt[0], pool)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                if job_id in self._cancelled or self._stop.is_set():
+                    return
+                for f in finished:
+                    index, pool = in_flight.pop(f)
+                    parts[index] = f.result()
+                    done += 1
+                    self.store.update(job_id, only_if_status=(RUNNING,), progress=round(done / len(chunks), 4))
+
+            result = merge_results(kind, parts)
+            path = self._write_result(job_id, result)
+            now = time.time()
+            if self.store.update(
+                job_id, only_if_status=(RUNNING,),
+                status=SUCCEEDED, progress=1.0, finished_at=now, expires_at=now + RESULT_TTL,
+                result_path=path, media_type=JOB_KINDS[kind].media_type,
+            ):
+                # Persist analyses exactly as POST /analyze does
+                analysis_store = get_analysis_store()
+                for request, response in stored_analyses(kind, job["payload"], result):
+                    analysis_store.record(request, response)
+        except BrokenProcessPool as e:
+            requeued = self._recover_pool(job, pool, e)
+        except Exception as e:
+            now = time.time()
+            self.store.update(
+                job_id, only_if_status=(RUNNING,),
+                status=FAILED, finished_at=now, expires_at=now + RESULT_TTL,
+                error=f"{type(e).__name__}: {e}",
+            )
+        finally:
+            # Free workers held by chunks this job no longer needs
+            for f in in_flight:
+                f.cancel()
+            with self._cond:
+                self._cancelled.discard(job_id)
+            if not requeued:
+                self._restarts.pop(job_id, None)
+
+    def _recover_pool(self, job: dict, broken: Optional[ProcessPoolExecutor], error: BrokenProcessPool) -> bool:
+        """
+        Replace a pool whose worker process died and requeue the job.
+
+        Returns False if the job was failed instead (after MAX_POOL_RESTARTS)
+        or left for recover() because the manager is shutting down.
+        """
+        job_id = job["id"]
+        with self._cond:
+            if self._pool is None:
+                return False  # shutting down; recover() requeues the job
+            # Every job on a broken pool lands here; only the first, while the
+            # broken pool is still current, replaces it
+            if broken is self._pool:
+                self._pool = self._new_pool()
+                broken.shutdown(wait=False, cancel_futures=True)
+            restarts = self._restarts.get(job_id, 0) + 1
+            if restarts <= MAX_POOL_RESTARTS and self.store.update(
+                job_id, only_if_status=(RUNNING,),
+                status=QUEUED, progress=0.0, started_at=None,
+            ):
+                self._restarts[job_id] = restarts
+                self._push(job_id, job["priority"])
+                return True
+        now = time.time()
+        self.store.update(
+            job_id, only_if_status=(RUNNING,),
+            status=FAILED, finished_at=now, expires_at=now + RESULT_TTL,
+            error=f"{type(error).__name__}: {error}",
+        )
+        return False
+
+    def _write_result(self, job_id: str, result) -> str:
+        is_pdf = isinstance(result, bytes)
+        path = os.path.join(self.result_dir, f"{job_id}.{'pdf' if is_pdf else 'json'}")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(result if is_pdf else json.dumps(result, separators=(",", ":")).encode())
+        os.replace(tmp, path)
+        return path
+
+    def _cleanup(self) -> None:
+        for job in self.store.pop_expired(time.time()):
+            if job["result_path"]:
+                try:
+                    os.remove(job["result_path"])
+                except OSError:
+                    pass
+
+    def _cleanup_loop(self) -> None:
+        while not self._stop.wait(CLEANUP_INTERVAL):
+            self._cleanup()
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager (created lazily, started on first use)."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager()
+    return _manager
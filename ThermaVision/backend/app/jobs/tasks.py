@@ -0,0 +1,109 @@
+"""
+Job kinds runnable on the background job queue.
+
+Every kind wraps an existing endpoint handler. Fleet-style payloads (a
+`plants` list) are split into chunks that run as separate work units on the
+process pool, which gives per-chunk progress and lets a cancel stop between
+chunks. run_chunk() is the function executed inside worker processes.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Type, Union
+from pydantic import BaseModel
+from ..models.schemas import (
+    AnalysisRequest,
+    BatchAnalysisRequest,
+    GoalSeekRequest,
+    ExploreRequest,
+    CascadeRequest,
+)
+from ..api.handlers import run_analysis, build_report_pdf, run_goal_seek, run_explore, run_cascade
+from ..engine.parameters import ParameterSnapshot
+
+# Plants per work unit for fleet jobs
+CHUNK_SIZE = 50
+
+JSON_MEDIA_TYPE = "application/json"
+PDF_MEDIA_TYPE = "application/pdf"
+
+
+class JobKind(NamedTuple):
+    model: Type[BaseModel]
+    run: Callable[[BaseModel, ParameterSnapshot], Union[dict, bytes]]
+    media_type: str
+    list_field: Optional[str] = None  # result field concatenated across chunks
+
+
+def _analyze_batch(req: BatchAnalysisRequest, params: ParameterSnapshot) -> dict:
+    return {
+        "results": [run_analysis(p, params).model_dump(mode="json") for p in req.plants],
+        "parameter_version": params.version,
+    }
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    "analyze": JobKind(
+        AnalysisRequest,
+        lambda req, params: run_analysis(req, params).model_dump(mode="json"),
+        JSON_MEDIA_TYPE,
+    ),
+    "analyze_batch": JobKind(BatchAnalysisRequest, _analyze_batch, JSON_MEDIA_TYPE, "results"),
+    "report": JobKind(AnalysisRequest, build_report_pdf, PDF_MEDIA_TYPE),
+    "goal_seek": JobKind(
+        GoalSeekRequest,
+        lambda req, params: run_goal_seek(req, params).model_dump(mode="json"),
+        JSON_MEDIA_TYPE,
+        "results",
+    ),
+    "explore": JobKind(
+        ExploreRequest,
+        lambda req, params: run_explore(req, params).model_dump(mode="json"),
+        JSON_MEDIA_TYPE,
+        "frontiers",
+    ),
+    "cascade": JobKind(
+        CascadeRequest,
+        lambda req, params: run_cascade(req, params).model_dump(mode="json"),
+        JSON_MEDIA_TYPE,
+    ),
+}
+
+
+def validate_payload(kind: str, payload: dict) -> dict:
+    """Validate a payload against the kind's request model; returns the normalised JSON form."""
+    return JOB_KINDS[kind].model.model_validate(payload).model_dump(mode="json")
+
+
+def split_payload(kind: str, payload: dict) -> List[dict]:
+    """Work units for a job: one per CHUNK_SIZE plants, or the whole payload."""
+    if JOB_KINDS[kind].list_field is None:
+        return [payload]
+    plants = payload["plants"]
+    return [
+        {**payload, "plants": plants[i:i + CHUNK_SIZE]}
+        for i in range(0, len(plants), CHUNK_SIZE)
+    ]
+
+
+def merge_results(kind: str, parts: List[Union[dict, bytes]]) -> Union[dict, bytes]:
+    """Combine chunk results in submission order."""
+    field = JOB_KINDS[kind].list_field
+    if field is None:
+        return parts[0]
+    merged = dict(parts[0])
+    merged[field] = [item for part in parts for item in part[field]]
+    return merged
+
+
+def stored_analyses(kind: str, payload: dict, result: Union[dict, bytes]) -> List[Tuple[dict, dict]]:
+    """(request, response) pairs of a finished job to record in the analysis store."""
+    if kind == "analyze":
+        return [(payload, result)]
+    if kind == "analyze_batch":
+        return list(zip(payload["plants"], result["results"]))
+    return []
+
+
+def run_chunk(kind: str, payload: dict, params: ParameterSnapshot) -> Union[dict, bytes]:
+    """Execute one work unit (runs inside a pool worker process)."""
+    spec = JOB_KINDS[kind]
+    return spec.run(spec.model.model_validate(payload), params)
@@ -9,7 +9,11 @@ FastAPI application entry point.
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from .api.routes import router
+from .api.compression import SelectiveGZipMiddleware
 from .models.schemas import ChatRequest, ChatResponse
+from .storage.analysis_store import get_analysis_store
+from .engine.parameters import get_registry
+from .jobs.manager import get_job_manager
 from groq import Groq
 from dotenv import load_dotenv
 import os
@@ -59,8 +63,27 @@ async def startup_event():
         print(f"GROQ_API_KEY: Found ({api_key[:4]}...{api_key[-4:]})")
     else:
         print(f"GROQ_API_KEY: NOT FOUND or default. Chatbot will use mock responses.")
+    params = get_registry().reload()
+    print(f"Parameters: {get_registry().path} (version {params.version})")
+    store = get_analysis_store()
+    store.start()
+    print(f"Analysis store: {store.path}")
+    get_job_manager().start()
+    print(f"Job results: {get_job_manager().result_dir}")
     print(f"-----------------------")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Flush any analyses still waiting in the write batch
+    get_analysis_store().close()
+    # Running jobs are requeued on the next startup
+    get_job_manager().shutdown()
+
+# Compress large responses (batch / fleet JSON) above this many bytes;
+# PDFs are already compressed and pass through as-is
+GZIP_MINIMUM_SIZE = 2048
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # CORS — allow the frontend (served on any origin during dev)
 app.add_middleware(
     CORSMiddleware,
@@ -68,6 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Content-Location"],
 )
 
 app.include_router(router)
@@ -4,7 +4,7 @@ All engineering units are documented in field descriptions.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 
 
@@ -51,6 +51,10 @@ class AnalysisRequest(BaseModel):
         gt=0,
         description="Current steam demand (kg/hr)"
     )
+    plant_id: Optional[str] = Field(
+        default=None, max_length=64,
+        description="Plant identifier used to group stored analyses"
+    )
 
 
 class ScenarioResult(BaseModel):
@@ -113,6 +117,257 @@ class AnalysisResponse(BaseModel):
     energy_recovered_pct: float
     energy_lost_pct: float
 
+    # Engine parameter tables used for this analysis
+    parameter_version: Optional[str] = None
+
+
+class StoredAnalysisSummary(BaseModel):
+    """Indexed columns of one persisted analysis."""
+
+    id: int
+    created_at: float = Field(..., description="Unix timestamp of the analysis")
+    plant_id: Optional[str] = None
+    fuel_type: FuelType
+    flue_temp_in: float
+    flue_temp_out: float
+    flow_rate: float
+    heat_recovered_kW: float
+    annual_savings: float
+    payback_years: float
+    co2_reduction_tons: float
+
+
+class StoredAnalysis(StoredAnalysisSummary):
+    """A persisted analysis with its full request and response."""
+
+    request: AnalysisRequest
+    response: AnalysisResponse
+
+
+class AnalysisPage(BaseModel):
+    """One keyset-paginated page of stored analyses."""
+
+    items: List[StoredAnalysisSummary]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as ?cursor= to fetch the next page"
+    )
+
+
+class ParameterSet(BaseModel):
+    """Active engine parameter tables (see engine/parameters.py)."""
+
+    version: str
+    cp_flue_gas: float = Field(..., description="Specific heat of flue gas (kJ/kg·K)")
+    latent_heat_steam: float = Field(..., description="Latent heat of steam (kJ/kg)")
+    dew_point_threshold: float = Field(..., description="Acid dew point (°C)")
+    boiler_delta_t: float = Field(..., description="ΔT above which a waste heat boiler is recommended (°C)")
+    economizer_delta_t: float = Field(..., description="ΔT above which an economizer is recommended (°C)")
+    emission_factors: Dict[str, float] = Field(..., description="kg CO₂ per kg fuel, by fuel type")
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Payload for an analyze_batch job — one full analysis per plant."""
+
+    plants: List[AnalysisRequest] = Field(..., min_length=1, max_length=100000)
+
+
+class TargetMetric(str, Enum):
+    PAYBACK_YEARS = "payback_years"
+    ANNUAL_SAVINGS = "annual_savings"
+    CO2_REDUCTION_TONS = "co2_reduction_tons"
+    HEAT_RECOVERED_KW = "heat_recovered_kW"
+    STEAM_SAVED_KG_HR = "steam_saved_kg_hr"
+    EFFICIENCY_GAIN_PCT = "efficiency_gain_pct"
+
+
+class FreeVariable(str, Enum):
+    FLUE_TEMP_OUT = "flue_temp_out"
+    FLUE_TEMP_IN = "flue_temp_in"
+    FLOW_RATE = "flow_rate"
+    FUEL_COST = "fuel_cost"
+    OPERATING_HOURS = "operating_hours"
+    INSTALLATION_COST = "installation_cost"
+
+
+class GoalSeekRequest(BaseModel):
+    """Input payload for the /goal-seek endpoint."""
+
+    plants: List[AnalysisRequest] = Field(
+        ..., min_length=1, max_length=10000,
+        description="Plants to solve; the free variable's value in each is ignored"
+    )
+    target_metric: TargetMetric = Field(..., description="Output metric to hit")
+    target_value: float = Field(..., gt=0, description="Desired value of the target metric")
+    free_variable: FreeVariable = Field(..., description="Input solved for; all others stay fixed")
+    respect_dew_point: bool = Field(
+        default=True,
+        description="Keep the outlet temperature at or above the acid dew point"
+    )
+
+
+class GoalSeekResult(BaseModel):
+    """Inverse-solve result for one plant."""
+
+    plant_id: Optional[str] = None
+    required_value: Optional[float] = Field(
+        default=None, description="Free-variable value that hits the target"
+    )
+    feasible: bool = Field(..., description="True if the required value is within schema and dew-point bounds")
+    method: Optional[str] = Field(default=None, description="'closed_form' or 'bracketed'")
+    achieved: Optional[float] = Field(
+        default=None, description="Target metric recomputed by the calculator at the required value"
+    )
+    message: Optional[str] = None
+
+
+class GoalSeekResponse(BaseModel):
+    """Complete response from the /goal-seek endpoint."""
+
+    target_metric: TargetMetric
+    target_value: float
+    free_variable: FreeVariable
+    results: List[GoalSeekResult]
+    parameter_version: str
+
+
+class ExploreRequest(BaseModel):
+    """Input payload for the /explore endpoint."""
+
+    plants: List[AnalysisRequest] = Field(..., min_length=1, max_length=2000)
+    temp_step: float = Field(
+        default=1.0, gt=0, le=50,
+        description="Outlet temperature sweep step (°C)"
+    )
+    min_outlet_temp: float = Field(
+        default=60.0, gt=30, lt=600,
+        description="Lowest outlet temperature to consider (°C); designs below the dew point carry corrosion risk"
+    )
+
+
+class PlantFrontier(BaseModel):
+    """Non-dominated designs for one plant as parallel arrays, sorted by capex."""
+
+    plant_id: Optional[str] = None
+    candidates: int = Field(..., description="Designs evaluated for this plant")
+    flue_temp_out: List[float]
+    hx_type: List[int] = Field(..., description="Index into ExploreResponse.hx_types")
+    material: List[int] = Field(..., description="Index into ExploreResponse.materials")
+    capex: List[float]
+    annual_savings: List[float]
+    co2_reduction_tons: List[float]
+    corrosion_risk: List[float] = Field(..., description="0 (safe) to 1 (severe)")
+    payback_years: List[float]
+
+
+class ExploreResponse(BaseModel):
+    """Complete response from the /explore endpoint."""
+
+    hx_types: List[str]
+    materials: List[str]
+    frontiers: List[PlantFrontier]
+    parameter_version: str
+
+
+class CascadeRank(str, Enum):
+    PAYBACK_YEARS = "payback_years"
+    ANNUAL_SAVINGS = "annual_savings"
+    NET_VALUE_5YR = "net_value_5yr"
+
+
+class CascadeRequest(BaseModel):
+    """Input payload for the /cascade endpoint."""
+
+    plant: AnalysisRequest
+    temp_step: float = Field(
+        default=10.0, ge=1, le=100,
+        description="Grid spacing for intermediate and tail temperatures (°C)"
+    )
+    min_stage_delta_t: float = Field(
+        default=10.0, gt=0, le=300,
+        description="Smallest temperature drop across any one stage (°C)"
+    )
+    max_stages: int = Field(default=3, ge=1, le=3, description="Longest chain to consider")
+    rank_by: CascadeRank = Field(default=CascadeRank.PAYBACK_YEARS)
+    top_k: int = Field(default=20, ge=1, le=500, description="Number of ranked cascades returned")
+
+
+class CascadeStage(BaseModel):
+    """One stage of a cascade."""
+
+    stage: str
+    temp_in: float
+    temp_out: float
+    heat_recovered_kW: float
+    capex: float
+    annual_savings: float
+
+
+class CascadeConfig(BaseModel):
+    """A ranked chain of stages with its totals."""
+
+    stages: List[CascadeStage]
+    capex: float
+    annual_savings: float
+    co2_reduction_tons: float
+    heat_recovered_kW: float
+    payback_years: float
+    net_value_5yr: float = Field(..., description="Five years of savings minus capex")
+
+
+class CascadeResponse(BaseModel):
+    """Complete response from the /cascade endpoint."""
+
+    plant_id: Optional[str] = None
+    rank_by: CascadeRank
+    configurations_evaluated: int
+    stage_evaluations: int = Field(..., description="Distinct (stage, T_in, T_out) evaluations after memoization")
+    cascades: List[CascadeConfig]
+    parameter_version: str
+
+
+class JobKind(str, Enum):
+    ANALYZE = "analyze"
+    ANALYZE_BATCH = "analyze_batch"
+    REPORT = "report"
+    GOAL_SEEK = "goal_seek"
+    EXPLORE = "explore"
+    CASCADE = "cascade"
+
+
+class JobSubmitRequest(BaseModel):
+    """Input payload for POST /jobs."""
+
+    kind: JobKind = Field(..., description="Endpoint logic to run as a job")
+    payload: dict = Field(..., description="Request body the endpoint would accept")
+    priority: int = Field(
+        default=0, ge=-10, le=10,
+        description="Higher runs first; equal priorities run in submission order"
+    )
+
+
+class JobStatus(BaseModel):
+    """State of a background job."""
+
+    id: str
+    kind: JobKind
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    priority: int
+    progress: float = Field(..., description="Fraction of work units completed (0–1)")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = Field(default=None, description="When the result is deleted")
+    parameter_version: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ReportLink(BaseModel):
+    """Content-addressed location of a report (GET /report/{content_hash}?v={parameter_version})."""
+
+    content_hash: str
+    parameter_version: str
+    url: str
+
 
 class ChatRequest(BaseModel):
     """Payload for the /chat endpoint."""
@@ -0,0 +1,359 @@
+"""
+Persistent analysis store backed by a local SQLite database.
+
+Every /analyze request/response pair is recorded so plants can be revisited
+without recomputing. Writes are group-committed by a background writer thread
+so the request path only pays for a queue put. The hot query columns are
+indexed and paginated with keyset cursors, which keeps lookups in the
+millisecond range even with millions of stored analyses.
+"""
+
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Backend root (…/backend) — the default database lives in backend/data/
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "thermavision.db")
+
+# Group-commit tuning: flush when this many rows are pending or after this delay
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.25  # seconds
+
+# Sortable columns → SQL direction. The id tie-breaker follows the same direction.
+SORT_KEYS = {
+    "id": "DESC",
+    "payback_years": "ASC",
+    "co2_reduction_tons": "DESC",
+    "annual_savings": "DESC",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id                 INTEGER PRIMARY KEY,
+    created_at         REAL    NOT NULL,
+    plant_id           TEXT,
+    fuel_type          TEXT    NOT NULL,
+    flue_temp_in       REAL    NOT NULL,
+    flue_temp_out      REAL    NOT NULL,
+    flow_rate          REAL    NOT NULL,
+    heat_recovered_kW  REAL    NOT NULL,
+    annual_savings     REAL    NOT NULL,
+    payback_years      REAL    NOT NULL,
+    co2_reduction_tons REAL    NOT NULL,
+    request_json       TEXT    NOT NULL,
+    response_json      TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_plant        ON analyses (plant_id, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_payback      ON analyses (payback_years, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_co2          ON analyses (co2_reduction_tons, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_savings      ON analyses (annual_savings, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_fuel_payback ON analyses (fuel_type, payback_years, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_fuel_co2     ON analyses (fuel_type, co2_reduction_tons, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_fuel_savings ON analyses (fuel_type, annual_savings, id);
+
+-- Report requests addressed by content hash (GET /report/{hash})
+CREATE TABLE IF NOT EXISTS report_requests (
+    content_hash TEXT PRIMARY KEY,
+    created_at   REAL NOT NULL,
+    request_json TEXT NOT NULL
+);
+"""
+
+_INSERT = """
+INSERT INTO analyses (
+    created_at, plant_id, fuel_type, flue_temp_in, flue_temp_out, flow_rate,
+    heat_recovered_kW, annual_savings, payback_years, co2_reduction_tons,
+    request_json, response_json
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SUMMARY_COLUMNS = (
+    "id, created_at, plant_id, fuel_type, flue_temp_in, flue_temp_out, flow_rate, "
+    "heat_recovered_kW, annual_savings, payback_years, co2_reduction_tons"
+)
+
+
+def encode_cursor(sort: str, sort_value: float, row_id: int) -> str:
+    """Opaque keyset cursor: the sort key and the (sort value, id) of the last row returned."""
+    raw = json.dumps([sort, sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[float, int]:
+    """
+    Inverse of encode_cursor for a listing sorted by `sort`.
+
+    Raises ValueError on malformed input or a cursor issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if cursor_sort != sort:
+        raise ValueError(f"Pagination cursor was issued for sort={cursor_sort}, not sort={sort}")
+    for item in (value, row_id):
+        if not isinstance(item, (int, float)) or isinstance(item, bool):
+            raise ValueError("Invalid pagination cursor")
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return value, row_id
+
+
+class AnalysisStore:
+    """
+    SQLite-backed store of analysis request/response pairs.
+
+    record() is non-blocking: rows go onto an in-memory queue and a single
+    writer thread commits them in batches. Reads use one connection per
+    thread, so concurrent query endpoints never share a cursor.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.getenv("THERMAVISION_DB_PATH", DEFAULT_DB_PATH)
+        return self._path
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def start(self) -> None:
+        """Create the schema and launch the writer thread (idempotent)."""
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            conn.close()
+            self._writer = threading.Thread(
+                target=self._write_loop, name="analysis-store-writer", daemon=True
+            )
+            self._writer.start()
+
+    def close(self) -> None:
+        """Flush pending rows and stop the writer thread."""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every queued row has been committed."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(self, request: dict, response: dict) -> None:
+        """Queue one analysis for persistence. Never blocks on disk I/O."""
+        self.start()
+        self._queue.put((
+            time.time(),
+            request.get("plant_id"),
+            request["fuel_type"],
+            request["flue_temp_in"],
+            request["flue_temp_out"],
+            request["flow_rate"],
+            response["heat_recovered_kW"],
+            response["annual_savings"],
+            response["payback_years"],
+            response["co2_reduction_tons"],
+            json.dumps(request, separators=(",", ":")),
+            json.dumps(response, separators=(",", ":")),
+        ))
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            batch: List[tuple] = []
+            item = self._queue.get()
+            if item is None:
+                stopping = True
+            else:
+                batch.append(item)
+                # Gather more rows until the batch is full or the window closes
+                deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+                while len(batch) < WRITE_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+            if batch:
+                self._commit_batch(conn, batch)
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self._queue.task_done()
+        conn.close()
+
+    @staticmethod
+    def _commit_batch(conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        """Insert a batch in one transaction; on failure, retry row by row so only bad rows are lost."""
+        try:
+            with conn:
+                conn.executemany(_INSERT, batch)
+            return
+        except sqlite3.Error:
+            pass
+        for row in batch:
+            try:
+                with conn:
+                    conn.execute(_INSERT, row)
+            except sqlite3.Error as exc:
+                print(f"[analysis-store] dropped analysis (plant_id={row[1]!r}): {exc}")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.start()
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def query(
+        self,
+        plant_id: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        min_payback: Optional[float] = None,
+        max_payback: Optional[float] = None,
+        min_co2: Optional[float] = None,
+        max_co2: Optional[float] = None,
+        sort: str = "id",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Filtered, keyset-paginated listing of stored analysis summaries.
+
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unsupported sort key: {sort}")
+        direction = SORT_KEYS[sort]
+
+        clauses: List[str] = []
+        args: list = []
+        for column, op, value in (
+            ("plant_id", "=", plant_id),
+            ("fuel_type", "=", fuel_type),
+            ("payback_years", ">=", min_payback),
+            ("payback_years", "<=", max_payback),
+            ("co2_reduction_tons", ">=", min_co2),
+            ("co2_reduction_tons", "<=", max_co2),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                args.append(value)
+
+        if cursor is not None:
+            last_value, last_id = decode_cursor(cursor, sort)
+            op = ">" if direction == "ASC" else "<"
+            if sort == "id":
+                clauses.append(f"id {op} ?")
+                args.append(last_id)
+            else:
+                clauses.append(f"({sort}, id) {op} (?, ?)")
+                args.extend([last_value, last_id])
+
+        order = "id" if sort == "id" else f"{sort} {direction}, id"
+        sql = f"SELECT {_SUMMARY_COLUMNS} FROM analyses"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order} {direction} LIMIT ?"
+        args.append(limit + 1)
+
+        rows = [dict(r) for r in self._reader().execute(sql, args).fetchall()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(sort, last[sort], last["id"])
+        return rows, next_cursor
+
+    def get(self, analysis_id: int) -> Optional[dict]:
+        """Full stored record (including request and response) or None."""
+        row = self._reader().execute(
+            f"SELECT {_SUMMARY_COLUMNS}, request_json, response_json "
+            "FROM analyses WHERE id = ?",
+            (analysis_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["request"] = json.loads(record.pop("request_json"))
+        record["response"] = json.loads(record.pop("response_json"))
+        return record
+
+
+    # ------------------------------------------------------------------
+    # Content-addressed report requests
+    # ------------------------------------------------------------------
+
+    def save_report_request(self, content_hash: str, request: dict) -> None:
+        """Remember a report request under its hash (written immediately, idempotent)."""
+        conn = self._reader()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO report_requests (content_hash, created_at, request_json) "
+                "VALUES (?, ?, ?)",
+                (content_hash, time.time(), json.dumps(request, separators=(",", ":"))),
+            )
+
+    def get_report_request(self, content_hash: str) -> Optional[dict]:
+        row = self._reader().execute(
+            "SELECT request_json FROM report_requests WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return json.loads(row["request_json"]) if row else None
+
+
+_store: Optional[AnalysisStore] = None
+
+
+def get_analysis_store() -> AnalysisStore:
+    """Process-wide store instance (path resolved lazily from the environment)."""
+    global _store
+    if _store is None:
+        _store = AnalysisStore()
+    return _store
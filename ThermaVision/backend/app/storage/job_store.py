@@ -0,0 +1,141 @@
+"""
+Durable job records for the background job queue.
+
+Job state lives in the same local SQLite database as the analysis store, so
+queued and running jobs survive a server restart and are picked up again on
+the next startup. Result payloads are written to disk by the job manager;
+this table only records where they are.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional
+from .analysis_store import DEFAULT_DB_PATH
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id                TEXT    PRIMARY KEY,
+    kind              TEXT    NOT NULL,
+    status            TEXT    NOT NULL,
+    priority          INTEGER NOT NULL,
+    payload_json      TEXT    NOT NULL,
+    progress          REAL    NOT NULL DEFAULT 0,
+    created_at        REAL    NOT NULL,
+    started_at        REAL,
+    finished_at       REAL,
+    expires_at        REAL,
+    parameter_version TEXT,
+    error             TEXT,
+    result_path       TEXT,
+    media_type        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status  ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs (expires_at);
+"""
+
+_UPDATABLE = (
+    "status", "progress", "started_at", "finished_at", "expires_at",
+    "parameter_version", "error", "result_path", "media_type",
+)
+
+
+class JobStore:
+    """SQLite table of job records, safe to use from several threads."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("THERMAVISION_DB_PATH", DEFAULT_DB_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job.pop("payload_json"))
+        return job
+
+    def create(self, kind: str, payload: dict, priority: int) -> dict:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, payload_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, priority, json.dumps(payload, separators=(",", ":")), time.time()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def update(self, job_id: str, only_if_status: Optional[tuple] = None, **fields) -> bool:
+        """
+        Set columns on a job. With only_if_status, the update applies only if
+        the job is currently in one of those states; returns whether it did.
+        """
+        unknown = set(fields) - set(_UPDATABLE)
+        if unknown:
+            raise ValueError(f"Cannot update job column(s): {', '.join(sorted(unknown))}")
+        sql = "UPDATE jobs SET " + ", ".join(f"{k} = ?" for k in fields) + " WHERE id = ?"
+        args = list(fields.values()) + [job_id]
+        if only_if_status:
+            sql += f" AND status IN ({', '.join('?' for _ in only_if_status)})"
+            args.extend(only_if_status)
+        with self._lock, self._conn:
+            return self._conn.execute(sql, args).rowcount > 0
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)
+            ).fetchone()[0]
+
+    def recover(self) -> List[dict]:
+        """
+        Requeue jobs interrupted by a shutdown and return every queued job,
+        oldest first.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, progress = 0, started_at = NULL WHERE status = ?",
+                (QUEUED, RUNNING),
+            )
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [self._to_dict(r) for r in rows]
+
+    def pop_expired(self, now: float) -> List[dict]:
+        """Delete finished jobs past their expiry and return them (for file cleanup)."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+            )
+        return [self._to_dict(r) for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,102 @@
+"""Keyset pagination and cursor handling of the analysis store."""
+
+import random
+
+import pytest
+
+from app.storage.analysis_store import AnalysisStore, SORT_KEYS, encode_cursor, decode_cursor
+
+FUELS = ("Coal", "Natural Gas", "Biomass")
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    s = AnalysisStore(str(tmp_path_factory.mktemp("store") / "analyses.db"))
+    rng = random.Random(7)
+    for i in range(257):
+        request = {
+            "plant_id": f"P{i % 5}",
+            "fuel_type": FUELS[i % len(FUELS)],
+            "flue_temp_in": 400.0,
+            "flue_temp_out": 150.0,
+            "flow_rate": 10000.0,
+        }
+        # Few distinct values, so ties on the sort column are common
+        response = {
+            "heat_recovered_kW": 694.44,
+            "annual_savings": float(rng.randint(1, 20) * 1000),
+            "payback_years": float(rng.randint(1, 10)) / 2,
+            "co2_reduction_tons": float(rng.randint(1, 8) * 10),
+        }
+        s.record(request, response)
+    s.flush()
+    yield s
+    s.close()
+
+
+def _all_pages(store, limit, **filters):
+    rows, cursor = store.query(limit=limit, **filters)
+    pages = [rows]
+    while cursor is not None:
+        rows, cursor = store.query(limit=limit, cursor=cursor, **filters)
+        pages.append(rows)
+    return pages
+
+
+def _expected_order(rows, sort):
+    if sort == "id":
+        return sorted(rows, key=lambda r: -r["id"])
+    if SORT_KEYS[sort] == "ASC":
+        return sorted(rows, key=lambda r: (r[sort], r["id"]))
+    return sorted(rows, key=lambda r: (-r[sort], -r["id"]))
+
+
+def test_cursor_round_trip():
+    for sort, value, row_id in (("id", 42, 42), ("payback_years", 1.5, 7), ("annual_savings", 12000.0, 3)):
+        assert decode_cursor(encode_cursor(sort, value, row_id), sort) == (value, row_id)
+
+
+@pytest.mark.parametrize("sort", list(SORT_KEYS))
+@pytest.mark.parametrize("filters", [{}, {"fuel_type": "Coal"}, {"plant_id": "P3", "max_payback": 3.0}])
+def test_pages_cover_listing_in_order(store, sort, filters):
+    pages = _all_pages(store, 10, sort=sort, **filters)
+    assert all(len(p) == 10 for p in pages[:-1])
+    rows = [r for page in pages for r in page]
+    everything = [r for page in _all_pages(store, 500, sort="id", **filters) for r in page]
+    assert len(pages[0]) > 0
+    assert len({r["id"] for r in rows}) == len(rows) == len(everything)
+    assert rows == _expected_order(everything, sort)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    encode_cursor("payback_years", [1], 1),
+    encode_cursor("payback_years", 1.0, "1"),
+    encode_cursor("payback_years", True, 1),
+])
+def test_malformed_cursor_is_rejected(store, cursor):
+    with pytest.raises(ValueError):
+        store.query(sort="payback_years", cursor=cursor)
+
+
+def test_cursor_from_other_sort_is_rejected(store):
+    _, cursor = store.query(sort="payback_years", limit=5)
+    with pytest.raises(ValueError):
+        store.query(sort="annual_savings", cursor=cursor)
+
+
+def test_bad_row_does_not_drop_its_batch(tmp_path, capsys):
+    s = AnalysisStore(str(tmp_path / "analyses.db"))
+    request = {"fuel_type": "Coal", "flue_temp_in": 400.0, "flue_temp_out": 150.0, "flow_rate": 1000.0}
+    response = {"heat_recovered_kW": 1.0, "annual_savings": 1.0, "payback_years": 1.0, "co2_reduction_tons": 1.0}
+    for i in range(5):
+        s.record({**request, "plant_id": f"good-{i}"}, response)
+    s.record({**request, "plant_id": "bad"}, {**response, "co2_reduction_tons": None})
+    for i in range(5, 10):
+        s.record({**request, "plant_id": f"good-{i}"}, response)
+    s.flush()
+    rows, _ = s.query(limit=50)
+    s.close()
+    assert sorted(r["plant_id"] for r in rows) == sorted(f"good-{i}" for i in range(10))
+    out = capsys.readouterr().out
+    assert out.count("dropped analysis") == 1 and "'bad'" in out
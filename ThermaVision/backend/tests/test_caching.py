@@ -0,0 +1,55 @@
+"""ETag generation and If-None-Match matching."""
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.caching import make_etag, etag_matches
+from app.main import app
+from app.models.schemas import AnalysisRequest
+
+REQ = AnalysisRequest(
+    flue_temp_in=400, flue_temp_out=150, flow_rate=20000, fuel_type="Coal",
+    fuel_cost=8, operating_hours=8000, installation_cost=5e6,
+)
+
+
+def _request(method, if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def test_etag_is_weak_and_tracks_inputs():
+    etag = make_etag("analyze", REQ, "v1")
+    assert etag.startswith('W/"')
+    assert etag == make_etag("analyze", REQ.model_copy(), "v1")
+    assert etag != make_etag("analyze", REQ, "v2")
+    assert etag != make_etag("report", REQ, "v1")
+    assert etag != make_etag("analyze", REQ.model_copy(update={"fuel_cost": 9}), "v1")
+
+
+def test_etag_matching():
+    etag = make_etag("analyze", REQ, "v1")
+    bare = etag.removeprefix("W/")
+    assert etag_matches(_request("POST", etag), etag)
+    assert etag_matches(_request("POST", bare), etag)
+    assert etag_matches(_request("POST", f'"other", {etag}'), etag)
+    assert not etag_matches(_request("POST", '"other"'), etag)
+    assert not etag_matches(_request("POST"), etag)
+
+
+def test_star_only_matches_safe_methods():
+    etag = make_etag("report", REQ, "v1")
+    assert etag_matches(_request("GET", "*"), etag)
+    assert not etag_matches(_request("POST", "*"), etag)
+
+
+def test_pdf_is_not_gzipped(tmp_path, monkeypatch):
+    monkeypatch.setenv("THERMAVISION_DB_PATH", str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr("app.storage.analysis_store._store", None)
+    client = TestClient(app)
+    body = REQ.model_dump(mode="json")
+    pdf = client.post("/report", json=body, headers={"Accept-Encoding": "gzip"})
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert "content-encoding" not in pdf.headers
+    explore = client.post("/explore", json={"plants": [body] * 3}, headers={"Accept-Encoding": "gzip"})
+    assert explore.headers["content-encoding"] == "gzip"
@@ -0,0 +1,125 @@
+"""Cascade enumeration: search bound, memoization, constraints and ranking."""
+
+import itertools
+
+import pytest
+
+from app.engine.cascade import CascadeEvaluator, count_cascades, rank_cascades, temperature_grid
+from app.engine.explorer import HX_TYPES, CAPEX_SCALING_EXPONENT
+from app.engine.parameters import build_snapshot
+
+PARAMS = build_snapshot()
+
+PLANT = {
+    "flue_temp_in": 520.0,
+    "flue_temp_out": 180.0,
+    "flow_rate": 20_000.0,
+    "fuel_type": "Coal",
+    "fuel_cost": 8.0,
+    "operating_hours": 8_000.0,
+    "installation_cost": 5_000_000.0,
+}
+
+HX_INDEX = {hx.name: i for i, hx in enumerate(HX_TYPES)}
+
+
+@pytest.mark.parametrize("temp_step,max_stages", [(20.0, 1), (20.0, 2), (10.0, 3), (7.5, 3)])
+def test_count_bounds_enumeration(temp_step, max_stages):
+    grid = temperature_grid(PLANT["flue_temp_in"], temp_step, PARAMS.dew_point_threshold)
+    result = rank_cascades(PLANT, temp_step=temp_step, min_stage_delta_t=temp_step,
+                           max_stages=max_stages, top_k=5, params=PARAMS)
+    bound = count_cascades(len(grid), max_stages)
+    assert result["configurations_evaluated"] <= bound
+    # Only the boiler's minimum outlet temperature prunes the grid here
+    assert result["configurations_evaluated"] > 0.8 * bound
+
+
+def test_stage_evaluations_are_memoized(monkeypatch):
+    calls = []
+    original = CascadeEvaluator.stage
+
+    def counting_stage(self, hx_idx, temp_in, temp_out):
+        calls.append((hx_idx, temp_in, temp_out))
+        return original(self, hx_idx, temp_in, temp_out)
+
+    monkeypatch.setattr(CascadeEvaluator, "stage", counting_stage)
+    result = rank_cascades(PLANT, temp_step=20.0, min_stage_delta_t=20.0, max_stages=3, top_k=5, params=PARAMS)
+    # Every (type, T_in, T_out) is computed once, however many chains reach it
+    assert result["stage_evaluations"] == len(set(calls))
+    # One stage call per chain extension during the walk (a shared prefix is
+    # extended, not rebuilt), plus one per reported stage
+    walked = result["configurations_evaluated"]
+    reported = sum(len(c["stages"]) for c in result["cascades"])
+    assert len(calls) == walked + reported
+    assert result["stage_evaluations"] < walked
+
+
+def test_evaluator_returns_cached_stage():
+    evaluator = CascadeEvaluator(PLANT, PARAMS)
+    first = evaluator.stage(1, 400.0, 300.0)
+    assert evaluator.stage(1, 400.0, 300.0) is first
+    assert evaluator.evaluations == 1
+
+
+@pytest.mark.parametrize("rank_by", ["payback_years", "annual_savings", "net_value_5yr"])
+def test_cascades_respect_constraints(rank_by):
+    min_dt = 30.0
+    result = rank_cascades(PLANT, temp_step=10.0, min_stage_delta_t=min_dt, max_stages=3,
+                           rank_by=rank_by, top_k=50, params=PARAMS)
+    assert result["cascades"]
+    for c in result["cascades"]:
+        stages = c["stages"]
+        assert stages[0]["temp_in"] == PLANT["flue_temp_in"]
+        assert stages[-1]["temp_out"] >= PARAMS.dew_point_threshold
+        order = [HX_INDEX[s["stage"]] for s in stages]
+        assert order == sorted(set(order))  # boiler → economizer → preheater, each at most once
+        for prev, nxt in zip(stages, stages[1:]):
+            assert nxt["temp_in"] == prev["temp_out"]
+        for s in stages:
+            assert s["temp_in"] - s["temp_out"] >= min_dt
+            assert s["temp_out"] >= HX_TYPES[HX_INDEX[s["stage"]]].min_outlet_temp
+
+
+def _brute_force(plant, temp_step, min_dt, max_stages):
+    """Every valid cascade with totals computed straight from the cost model."""
+    p = PARAMS
+    dew = p.dew_point_threshold
+    base_delta = plant["flue_temp_in"] - plant["flue_temp_out"]
+    ef = p.emission_factor(plant["fuel_type"])
+    grid = temperature_grid(plant["flue_temp_in"], temp_step, dew)
+    out = []
+    for n in range(1, max_stages + 1):
+        for types in itertools.combinations(range(len(HX_TYPES)), n):
+            for temps in itertools.combinations(grid, n):  # grid is descending
+                t_in, capex, savings = plant["flue_temp_in"], 0.0, 0.0
+                valid = True
+                for hx_idx, t_out in zip(types, temps):
+                    hx = HX_TYPES[hx_idx]
+                    delta = t_in - t_out
+                    if delta < min_dt or t_out < max(dew, hx.min_outlet_temp):
+                        valid = False
+                        break
+                    steam = plant["flow_rate"] * p.cp_flue_gas * delta / p.latent_heat_steam * hx.utilization
+                    capex += plant["installation_cost"] * hx.capex_factor * (delta / base_delta) ** CAPEX_SCALING_EXPONENT
+                    savings += steam * plant["operating_hours"] * plant["fuel_cost"]
+                    t_in = t_out
+                if valid:
+                    out.append({"capex": capex, "savings": savings, "types": types, "temps": temps})
+    return out
+
+
+@pytest.mark.parametrize("rank_by,key,reverse", [
+    ("payback_years", lambda c: c["capex"] / c["savings"], False),
+    ("annual_savings", lambda c: c["savings"], True),
+    ("net_value_5yr", lambda c: 5 * c["savings"] - c["capex"], True),
+])
+def test_top_k_matches_brute_force(rank_by, key, reverse):
+    top_k = 15
+    expected = sorted(_brute_force(PLANT, 25.0, 25.0, 3), key=key, reverse=reverse)
+    result = rank_cascades(PLANT, temp_step=25.0, min_stage_delta_t=25.0, max_stages=3,
+                           rank_by=rank_by, top_k=top_k, params=PARAMS)
+    assert result["configurations_evaluated"] == len(expected)
+    got = [c[rank_by] for c in result["cascades"]]
+    want = [key(c) for c in expected[:top_k]]
+    assert got == pytest.approx([round(v, 2) for v in want], abs=0.011)
+    assert got == sorted(got, reverse=reverse)
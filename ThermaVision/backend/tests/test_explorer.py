@@ -0,0 +1,74 @@
+"""Pareto-frontier sweep checked against a brute-force dominance test."""
+
+import random
+
+import pytest
+
+from app.engine.explorer import evaluate_designs, explore_plant, pareto_front, count_candidates
+from app.engine.parameters import build_snapshot
+
+PARAMS = build_snapshot()
+
+PLANT = {
+    "plant_id": "P1",
+    "flue_temp_in": 420.0,
+    "flue_temp_out": 160.0,
+    "flow_rate": 25_000.0,
+    "fuel_type": "Coal",
+    "fuel_cost": 8.0,
+    "operating_hours": 8_000.0,
+    "installation_cost": 4_000_000.0,
+}
+
+
+def _dominates(a, b):
+    """a is no worse than b on (capex, savings, risk) and strictly better on one."""
+    no_worse = a[0] <= b[0] and a[1] >= b[1] and a[3] <= b[3]
+    better = a[0] < b[0] or a[1] > b[1] or a[3] < b[3]
+    return no_worse and better
+
+
+def _brute_force(designs):
+    front = []
+    for d in designs:
+        if any(_dominates(o, d) for o in designs):
+            continue
+        if any(o[:4] == d[:4] for o in front):
+            continue  # exact duplicate of a kept design
+        front.append(d)
+    return front
+
+
+def _key(d):
+    return (d[0], d[1], d[3])
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_pareto_front_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 60)
+    # Coarse values force ties in every objective
+    designs = [
+        (float(rng.randint(1, 8)), float(rng.randint(1, 8)), 0.0, rng.randint(0, 4) / 4, 0.0, i, 0)
+        for i in range(n)
+    ]
+    front = pareto_front(designs)
+    assert sorted(map(_key, front)) == sorted(map(_key, _brute_force(designs)))
+    assert [d[0] for d in front] == sorted(d[0] for d in front)
+
+
+def test_pareto_front_on_real_designs():
+    designs = evaluate_designs(PLANT, 5.0, 60.0, PARAMS)
+    front = pareto_front(designs)
+    assert sorted(map(_key, front)) == sorted(map(_key, _brute_force(designs)))
+
+
+def test_explore_plant_columns():
+    result = explore_plant(PLANT, temp_step=5.0, min_outlet_temp=60.0, params=PARAMS)
+    n = len(result["capex"])
+    assert n > 0
+    assert result["candidates"] <= count_candidates(PLANT["flue_temp_in"], 60.0, 5.0)
+    for column in ("flue_temp_out", "hx_type", "material", "annual_savings",
+                   "co2_reduction_tons", "corrosion_risk", "payback_years"):
+        assert len(result[column]) == n
+    assert result["capex"] == sorted(result["capex"])
@@ -0,0 +1,139 @@
+"""JobManager scheduling, bounded queue, cancellation and worker-crash recovery."""
+
+import os
+import signal
+import time
+
+import pytest
+
+from app.jobs import manager as manager_module
+from app.jobs.manager import JobManager, QueueFullError
+from app.storage.job_store import JobStore, QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+
+PLANT = {
+    "flue_temp_in": 790.0,
+    "flue_temp_out": 180.0,
+    "flow_rate": 20_000.0,
+    "fuel_type": "Coal",
+    "fuel_cost": 8.0,
+    "operating_hours": 8_000.0,
+    "installation_cost": 5_000_000.0,
+}
+
+# About a second of single-chunk work, to keep the only runner busy
+SLOW_CASCADE = {"plant": PLANT, "temp_step": 5}
+
+# Several chunks of roughly a second each on one worker
+SLOW_FLEET = {"plants": [PLANT] * 200, "temp_step": 1}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setenv("THERMAVISION_DB_PATH", str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr("app.storage.analysis_store._store", None)
+    monkeypatch.setattr(manager_module, "CONCURRENT_JOBS", 1)
+    m = JobManager(
+        store=JobStore(str(tmp_path / "jobs.db")),
+        result_dir=str(tmp_path / "results"),
+        max_workers=1,
+        max_queued=3,
+    )
+    m.start()
+    yield m
+    m.shutdown()
+
+
+def wait_for(predicate, timeout=60.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def status(m, job):
+    return m.get(job["id"])["status"]
+
+
+def finished(m, job):
+    return status(m, job) in (SUCCEEDED, FAILED, CANCELLED)
+
+
+def test_higher_priority_runs_first(manager):
+    blocker = manager.submit("cascade", SLOW_CASCADE)
+    assert wait_for(lambda: status(manager, blocker) == RUNNING)
+    low = manager.submit("analyze", PLANT, priority=0)
+    high = manager.submit("analyze", PLANT, priority=5)
+    assert wait_for(lambda: finished(manager, low) and finished(manager, high))
+    assert manager.get(high["id"])["started_at"] < manager.get(low["id"])["started_at"]
+    assert status(manager, low) == status(manager, high) == SUCCEEDED
+
+
+def test_queue_is_bounded(manager):
+    blocker = manager.submit("cascade", SLOW_CASCADE)
+    assert wait_for(lambda: status(manager, blocker) == RUNNING)
+    for _ in range(3):
+        manager.submit("analyze", PLANT)
+    with pytest.raises(QueueFullError):
+        manager.submit("analyze", PLANT)
+
+
+def test_cancel_queued_job(manager):
+    blocker = manager.submit("cascade", SLOW_CASCADE)
+    assert wait_for(lambda: status(manager, blocker) == RUNNING)
+    queued = manager.submit("analyze", PLANT)
+    assert manager.cancel(queued["id"])["status"] == CANCELLED
+    # Only running jobs are tracked for cooperative cancellation
+    assert queued["id"] not in manager._cancelled
+    assert wait_for(lambda: finished(manager, blocker))
+    assert manager.get(queued["id"])["started_at"] is None
+    assert manager.result(queued["id"]) is None
+
+
+def test_cancel_running_job_stops_between_chunks(manager):
+    job = manager.submit("explore", SLOW_FLEET)
+    assert wait_for(lambda: status(manager, job) == RUNNING)
+    assert manager.cancel(job["id"])["status"] == CANCELLED
+    assert wait_for(lambda: not manager._cancelled)
+    record = manager.get(job["id"])
+    assert record["status"] == CANCELLED
+    assert record["progress"] < 1.0
+    assert manager.result(job["id"]) is None
+    # The worker is free again for the next job
+    follow_up = manager.submit("analyze", PLANT)
+    assert wait_for(lambda: finished(manager, follow_up), timeout=10)
+    assert status(manager, follow_up) == SUCCEEDED
+
+
+def _kill_worker(manager):
+    assert wait_for(lambda: manager._pool._processes)
+    pid = next(iter(manager._pool._processes))
+    os.kill(pid, signal.SIGKILL)
+
+
+def test_worker_crash_requeues_job_and_replaces_pool(manager):
+    job = manager.submit("cascade", SLOW_CASCADE)
+    assert wait_for(lambda: status(manager, job) == RUNNING)
+    broken = manager._pool
+    _kill_worker(manager)
+    assert wait_for(lambda: finished(manager, job))
+    assert status(manager, job) == SUCCEEDED
+    assert manager._pool is not broken
+    follow_up = manager.submit("analyze", PLANT)
+    assert wait_for(lambda: finished(manager, follow_up))
+    assert status(manager, follow_up) == SUCCEEDED
+
+
+def test_worker_crash_fails_job_after_restart_limit(manager, monkeypatch):
+    monkeypatch.setattr(manager_module, "MAX_POOL_RESTARTS", 0)
+    job = manager.submit("cascade", SLOW_CASCADE)
+    assert wait_for(lambda: status(manager, job) == RUNNING)
+    _kill_worker(manager)
+    assert wait_for(lambda: finished(manager, job))
+    record = manager.get(job["id"])
+    assert record["status"] == FAILED
+    assert "BrokenProcessPool" in record["error"]
+    follow_up = manager.submit("analyze", PLANT)
+    assert wait_for(lambda: finished(manager, follow_up))
+    assert status(manager, follow_up) == SUCCEEDED
@@ -0,0 +1,81 @@
+"""Durable job records and chunking of job payloads."""
+
+import time
+
+import pytest
+
+from app.jobs.tasks import CHUNK_SIZE, split_payload, merge_results, stored_analyses
+from app.storage.job_store import JobStore, QUEUED, RUNNING, SUCCEEDED, CANCELLED
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = JobStore(str(tmp_path / "jobs.db"))
+    yield s
+    s.close()
+
+
+def test_recover_requeues_interrupted_jobs(store):
+    queued = store.create("analyze", {"n": 1}, priority=0)
+    running = store.create("explore", {"n": 2}, priority=5)
+    done = store.create("report", {"n": 3}, priority=0)
+    store.update(running["id"], status=RUNNING, started_at=time.time(), progress=0.5)
+    store.update(done["id"], status=SUCCEEDED, progress=1.0)
+
+    recovered = store.recover()
+
+    assert [j["id"] for j in recovered] == [queued["id"], running["id"]]
+    again = store.get(running["id"])
+    assert again["status"] == QUEUED
+    assert again["progress"] == 0
+    assert again["started_at"] is None
+    assert again["payload"] == {"n": 2}
+    assert store.get(done["id"])["status"] == SUCCEEDED
+
+
+def test_recover_survives_reopen(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = JobStore(path)
+    job = first.create("analyze", {"n": 1}, priority=0)
+    first.update(job["id"], status=RUNNING)
+    first.close()
+
+    second = JobStore(path)
+    assert [j["id"] for j in second.recover()] == [job["id"]]
+    second.close()
+
+
+def test_conditional_update(store):
+    job = store.create("analyze", {}, priority=0)
+    assert store.update(job["id"], only_if_status=(QUEUED, RUNNING), status=CANCELLED)
+    assert not store.update(job["id"], only_if_status=(RUNNING,), status=SUCCEEDED)
+    assert store.get(job["id"])["status"] == CANCELLED
+    with pytest.raises(ValueError):
+        store.update(job["id"], kind="report")
+
+
+def test_pop_expired(store):
+    old = store.create("analyze", {}, priority=0)
+    fresh = store.create("analyze", {}, priority=0)
+    store.update(old["id"], status=SUCCEEDED, expires_at=100.0)
+    store.update(fresh["id"], status=SUCCEEDED, expires_at=time.time() + 3600)
+    assert [j["id"] for j in store.pop_expired(time.time())] == [old["id"]]
+    assert store.get(old["id"]) is None
+    assert store.get(fresh["id"]) is not None
+
+
+def test_split_and_merge_fleet_payload():
+    plants = [{"plant_id": str(i)} for i in range(CHUNK_SIZE * 2 + 3)]
+    chunks = split_payload("analyze_batch", {"plants": plants})
+    assert [len(c["plants"]) for c in chunks] == [CHUNK_SIZE, CHUNK_SIZE, 3]
+    parts = [{"results": c["plants"], "parameter_version": "v"} for c in chunks]
+    assert merge_results("analyze_batch", parts) == {"results": plants, "parameter_version": "v"}
+    assert split_payload("report", {"x": 1}) == [{"x": 1}]
+
+
+def test_stored_analyses_pairs():
+    plants = [{"plant_id": "a"}, {"plant_id": "b"}]
+    results = [{"annual_savings": 1}, {"annual_savings": 2}]
+    assert stored_analyses("analyze_batch", {"plants": plants}, {"results": results}) == list(zip(plants, results))
+    assert stored_analyses("analyze", plants[0], results[0]) == [(plants[0], results[0])]
+    assert stored_analyses("explore", {"plants": plants}, {"frontiers": []}) == []
@@ -0,0 +1,100 @@
+"""Parameter snapshot validation and hot reload."""
+
+import json
+import math
+
+import pytest
+
+from app.engine import parameters
+from app.engine.parameters import DEFAULT_VALUES, FUEL_INDEX, ParameterRegistry, build_snapshot
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(parameters, "RELOAD_CHECK_INTERVAL", 0.0)
+    path = tmp_path / "parameters.json"
+    path.write_text(json.dumps({"cp_flue_gas": 1.0}))
+    return ParameterRegistry(str(path))
+
+
+def _write(registry, text):
+    with open(registry.path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"unknown_key": 1},
+    {"cp_flue_gas": 0},
+    {"cp_flue_gas": -1.0},
+    {"cp_flue_gas": "1.0"},
+    {"cp_flue_gas": True},
+    {"cp_flue_gas": math.nan},
+    {"latent_heat_steam": math.inf},
+    {"economizer_delta_t": 150.0},
+    {"economizer_delta_t": 500.0},
+    {"emission_factors": {"Coal": -0.1}},
+    {"emission_factors": {"Coal": math.nan}},
+    {"emission_factors": {"Coal": -math.inf}},
+    {"emission_factors": {"Peat": 1.0}},
+    {"emission_factors": [2.4]},
+])
+def test_build_snapshot_rejects(overrides):
+    with pytest.raises(ValueError):
+        build_snapshot(overrides)
+
+
+def test_version_depends_only_on_effective_values():
+    defaults = build_snapshot()
+    assert build_snapshot({}).version == defaults.version
+    # Restating a default does not change the version
+    assert build_snapshot({"cp_flue_gas": DEFAULT_VALUES["cp_flue_gas"]}).version == defaults.version
+    assert build_snapshot({"emission_factors": {"Coal": 2.4}}).version == defaults.version
+    changed = build_snapshot({"emission_factors": {"Coal": 2.5}})
+    assert changed.version != defaults.version
+    assert changed.emission_factors[FUEL_INDEX["Coal"]] == 2.5
+
+
+def test_current_picks_up_changed_file(registry):
+    first = registry.current()
+    _write(registry, json.dumps({"cp_flue_gas": 1.05, "dew_point_threshold": 130}))
+    second = registry.current()
+    assert second.version != first.version
+    assert (second.cp_flue_gas, second.dew_point_threshold) == (1.05, 130.0)
+    # The old snapshot is an immutable object, untouched by the swap
+    assert first.cp_flue_gas == 1.0
+    with pytest.raises(AttributeError):
+        first.cp_flue_gas = 2.0
+
+
+@pytest.mark.parametrize("bad", [
+    '{"emission_factors": {"Coal": NaN}}',
+    '{"cp_flue_gas": Infinity}',
+    '{"cp_flue_gas": ',
+    '[1, 2]',
+])
+def test_invalid_file_keeps_snapshot_and_reports_once(registry, capsys, bad):
+    good = registry.current()
+    _write(registry, bad)
+    for _ in range(3):
+        assert registry.current() is good
+    assert capsys.readouterr().out.count("keeping version") == 1
+    with pytest.raises(ValueError):
+        registry.reload()
+    # Fixing the file is picked up again
+    _write(registry, json.dumps({"cp_flue_gas": 1.125}))
+    assert registry.current().cp_flue_gas == 1.125
+
+
+def test_missing_file_keeps_snapshot(registry, capsys):
+    good = registry.current()
+    parameters.os.remove(registry.path)
+    for _ in range(3):
+        assert registry.current() is good
+    assert capsys.readouterr().out.count("not found") == 1
+    with pytest.raises(ValueError):
+        registry.reload()
+
+
+def test_defaults_when_no_file_on_first_load(tmp_path):
+    registry = ParameterRegistry(str(tmp_path / "absent.json"))
+    assert registry.current().version == build_snapshot().version
@@ -0,0 +1,107 @@
+"""Goal-seek inversion checked against the forward calculator."""
+
+import math
+import random
+
+import pytest
+
+from app.engine.calculator import run_scenario
+from app.engine.parameters import build_snapshot
+from app.engine.solver import FREE_VARIABLES, _DEPENDS, closed_form, evaluate, solve_plant, schema_bounds
+from app.models.schemas import AnalysisRequest
+
+PARAMS = build_snapshot()
+BOUNDS = schema_bounds(AnalysisRequest)
+PAIRS = [(metric, var) for metric, deps in _DEPENDS.items() for var in deps]
+
+
+def _within(name, lo, hi):
+    """Clamp a sampling range to the AnalysisRequest bounds of a field (open bounds get a margin)."""
+    low, high = BOUNDS[name]
+    return max(lo, low + 1e-6), min(hi, high - 1e-6)
+
+
+def _plants(n, seed=11):
+    rng = random.Random(seed)
+    for _ in range(n):
+        temp_in = rng.uniform(*_within("flue_temp_in", 250, 800))
+        plant = {
+            "flue_temp_in": temp_in,
+            "flue_temp_out": rng.uniform(*_within("flue_temp_out", 130, temp_in - 40)),
+            "flow_rate": rng.uniform(*_within("flow_rate", 2_000, 80_000)),
+            "fuel_type": rng.choice(["Coal", "Natural Gas", "Fuel Oil", "Biomass"]),
+            "fuel_cost": rng.uniform(*_within("fuel_cost", 2, 60)),
+            "operating_hours": rng.uniform(*_within("operating_hours", 2_000, 8_760)),
+            "installation_cost": rng.uniform(*_within("installation_cost", 1e5, 5e7)),
+        }
+        AnalysisRequest.model_validate(plant)
+        yield plant
+
+
+def _scenario(v):
+    return run_scenario(
+        v["flow_rate"], v["flue_temp_in"], v["flue_temp_out"], v["fuel_type"],
+        v["fuel_cost"], v["operating_hours"], v["installation_cost"], params=PARAMS,
+    )
+
+
+@pytest.mark.parametrize("metric,var", PAIRS)
+def test_closed_form_hits_target_in_run_scenario(metric, var):
+    checked = 0
+    for plant in _plants(50):
+        # Target: the metric at the plant's own inputs, solved from a perturbed start
+        ef = PARAMS.emission_factor(plant["fuel_type"])
+        target = evaluate(plant, metric, PARAMS, ef)
+        start = {**plant, var: plant[var] * 1.3}
+        value = closed_form(start, metric, var, target, PARAMS, ef)
+        if value is None:
+            continue  # left to the bracketed solver
+        assert math.isfinite(value)
+        achieved = _scenario({**start, var: value})[metric]
+        assert achieved == pytest.approx(target, rel=2e-3, abs=0.02)
+        checked += 1
+    if (metric, var) != ("efficiency_gain_pct", "flue_temp_in"):
+        assert checked == 50
+
+
+@pytest.mark.parametrize("metric,var", PAIRS)
+def test_closed_form_matches_unrounded_model(metric, var):
+    for plant in _plants(50, seed=5):
+        ef = PARAMS.emission_factor(plant["fuel_type"])
+        target = evaluate(plant, metric, PARAMS, ef)
+        value = closed_form({**plant, var: plant[var] * 0.8}, metric, var, target, PARAMS, ef)
+        if value is not None:
+            assert value == pytest.approx(plant[var], rel=1e-9)
+
+
+def test_bracketed_fallback_for_efficiency_vs_inlet():
+    for plant in _plants(20, seed=3):
+        target = evaluate(plant, "efficiency_gain_pct", PARAMS, 0.0)
+        result = solve_plant(plant, "efficiency_gain_pct", "flue_temp_in", target, PARAMS, BOUNDS)
+        assert result["method"] == "bracketed"
+        if result["feasible"]:
+            assert result["required_value"] == pytest.approx(plant["flue_temp_in"], abs=1e-3)
+            assert result["achieved"] == pytest.approx(target, abs=0.01)
+
+
+def test_metric_independent_of_variable_is_reported():
+    plant = next(_plants(1))
+    result = solve_plant(plant, "efficiency_gain_pct", "fuel_cost", 10.0, PARAMS, BOUNDS)
+    assert not result["feasible"]
+    assert "does not depend" in result["message"]
+
+
+def test_every_free_variable_is_solvable_for_payback():
+    assert set(_DEPENDS["payback_years"]) == set(FREE_VARIABLES)
+
+
+@pytest.mark.parametrize("var", ["installation_cost", "flue_temp_in", "flow_rate", "operating_hours"])
+def test_fixed_outlet_below_dew_point_is_infeasible(var):
+    plant = {**next(_plants(1)), "flue_temp_out": 90.0}
+    target = 2.0
+    result = solve_plant(plant, "payback_years", var, target, PARAMS, BOUNDS, respect_dew_point=True)
+    assert not result["feasible"]
+    assert "dew point" in result["message"]
+    relaxed = solve_plant(plant, "payback_years", var, target, PARAMS, BOUNDS, respect_dew_point=False)
+    if relaxed["feasible"]:
+        assert relaxed["achieved"] == pytest.approx(target, abs=0.01)